@@ -4,16 +4,83 @@ Protected with basic auth for internal use
 """
 
 from flask import Blueprint, request, jsonify, make_response
-from middleware.demo_auth import create_demo_key, list_demo_keys, DEMO_KEYS
-from functools import wraps
+from middleware.demo_auth import create_demo_key, list_demo_keys, DEMO_KEYS, USAGE_LOG_FILE
+from functools import wraps, lru_cache
 import base64
+import hmac
+import json
 import os
+import threading
+import time
 import logging
+from collections import Counter, deque
 
 logger = logging.getLogger(__name__)
 
 admin_bp = Blueprint('admin', __name__)
 
+# Admin credentials are read once at import
+ADMIN_USER = os.environ.get('ADMIN_USER', 'admin').encode()
+ADMIN_PASS = os.environ.get('ADMIN_PASS', 'partspro2024!').encode()
+
+# Running usage aggregates, advanced incrementally from the last log offset
+_usage_state = {
+    'lock': threading.Lock(),
+    'offset': 0,
+    'total_requests': 0,
+    'companies': set(),
+    'endpoints': Counter(),
+    'recent': deque(maxlen=100)
+}
+
+# Seconds that a demo key listing may be served from cache
+DEMO_KEYS_CACHE_TTL = 5
+
+@lru_cache(maxsize=1)
+def _list_demo_keys_cached(bucket):
+    """Cached list_demo_keys(); bucket changes every DEMO_KEYS_CACHE_TTL seconds"""
+    return list_demo_keys()
+
+def cached_demo_keys():
+    """List demo keys, reusing the result for bursts of admin polling"""
+    return _list_demo_keys_cached(int(time.time() // DEMO_KEYS_CACHE_TTL))
+
+def update_usage_state():
+    """Fold log entries written since the previous call into _usage_state (caller holds the lock)"""
+    state = _usage_state
+    try:
+        with open(USAGE_LOG_FILE, 'rb') as f:
+            f.seek(0, os.SEEK_END)
+            size = f.tell()
+            if size < state['offset']:
+                # Log was truncated or rotated - start over
+                state.update(offset=0, total_requests=0, companies=set(), endpoints=Counter())
+                state['recent'].clear()
+            f.seek(state['offset'])
+            chunk = f.read()
+    except FileNotFoundError:
+        return
+    
+    # Leave any partially written last line for the next call
+    complete = chunk.rfind(b'\n') + 1
+    state['offset'] += complete
+    
+    # Single pass over the new entries, feeding every aggregate at once
+    companies = state['companies']
+    endpoints = state['endpoints']
+    recent = state['recent']
+    for line in chunk[:complete].split(b'\n'):
+        if not line.strip():
+            continue
+        try:
+            stat = json.loads(line)
+        except ValueError:
+            continue
+        state['total_requests'] += 1
+        companies.add(stat.get('company', 'Unknown'))
+        endpoints[stat.get('endpoint', 'unknown')] += 1
+        recent.append(stat)
+
 def require_admin_auth(f):
     """Simple admin authentication"""
     @wraps(f)
@@ -30,16 +97,17 @@ def require_admin_auth(f):
 
 def check_admin_credentials(username, password):
     """Check admin credentials - in production use proper auth"""
-    admin_user = os.environ.get('ADMIN_USER', 'admin')
-    admin_pass = os.environ.get('ADMIN_PASS', 'partspro2024!')
-    return username == admin_user and password == admin_pass
+    if username is None or password is None:
+        return False
+    # Compare both fields in constant time; bitwise & avoids short-circuiting
+    return hmac.compare_digest(username.encode(), ADMIN_USER) & hmac.compare_digest(password.encode(), ADMIN_PASS)
 
 @admin_bp.route('/demo-keys', methods=['GET'])
 @require_admin_auth
 def get_demo_keys():
     """List all demo keys and their status"""
     try:
-        keys_info = list_demo_keys()
+        keys_info = cached_demo_keys()
         return jsonify({
             'success': True,
             'keys': keys_info,
@@ -67,6 +135,7 @@ def create_demo_key_endpoint():
             days=data.get('days', 7),
             usage_limit=data.get('usage_limit', 100)
         )
+        _list_demo_keys_cached.cache_clear()
         
         return jsonify({
             'success': True,
@@ -89,8 +158,10 @@ def disable_demo_key(demo_key):
     """Disable a demo key"""
     try:
         if demo_key in DEMO_KEYS:
-            # Set usage to max to effectively disable
+            DEMO_KEYS[demo_key]['disabled'] = True
+            # Also max out usage so anything reading the counter sees it as spent
             DEMO_KEYS[demo_key]['current_usage'] = DEMO_KEYS[demo_key]['usage_limit']
+            _list_demo_keys_cached.cache_clear()
             
             return jsonify({
                 'success': True,
@@ -109,34 +180,18 @@ def disable_demo_key(demo_key):
 def get_demo_usage():
     """Get demo usage statistics"""
     try:
-        # Read usage log
-        usage_stats = []
-        try:
-            with open('logs/demo_usage.log', 'r') as f:
-                lines = f.readlines()[-100:]  # Last 100 entries
-                for line in lines:
-                    try:
-                        import json
-                        usage_stats.append(json.loads(line.strip()))
-                    except:
-                        continue
-        except FileNotFoundError:
-            pass
-        
-        # Calculate summary
-        total_requests = len(usage_stats)
-        companies = set(stat.get('company', 'Unknown') for stat in usage_stats)
-        endpoints = {}
-        
-        for stat in usage_stats:
-            endpoint = stat.get('endpoint', 'unknown')
-            endpoints[endpoint] = endpoints.get(endpoint, 0) + 1
+        with _usage_state['lock']:
+            update_usage_state()
+            total_requests = _usage_state['total_requests']
+            companies = list(_usage_state['companies'])
+            endpoints = dict(_usage_state['endpoints'])
+            usage_stats = list(_usage_state['recent'])
         
         return jsonify({
             'success': True,
             'total_requests': total_requests,
             'unique_companies': len(companies),
-            'companies': list(companies),
+            'companies': companies,
             'endpoint_usage': endpoints,
             'recent_usage': usage_stats[-20:] if usage_stats else []  # Last 20 entries
         })
@@ -150,7 +205,7 @@ def get_demo_usage():
 def demo_summary():
     """Get overall demo system summary"""
     try:
-        keys_info = list_demo_keys()
+        keys_info = cached_demo_keys()
         active_keys = [k for k in keys_info if not k['expired']]
         
         return jsonify({
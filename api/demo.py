@@ -4,338 +4,574 @@ These are protected versions of the main APIs for customer demos
 """
 
 from flask import Blueprint, request, jsonify, g
-from middleware.demo_auth import require_demo_key, add_demo_watermark
+from middleware.demo_auth import require_demo_key, add_demo_watermark, demo_status_payload
+from middleware.demo_auth import charge_demo_usage, USAGE_LIMIT_EXCEEDED
 from services.part_resolver import resolve_part_name
 from services.supplier_finder import find_suppliers
 from services.manual_finder import search_manuals
-from services.enrichment_service import EnrichmentService
+from api.enrichment import enrichment_service
+from api.demo_schemas import (
+    PartsResolveRequest, SupplierSearchRequest, ManualSearchRequest, ManualProcessRequest,
+    EquipmentEnrichmentRequest, PartEnrichmentRequest, BatchRequest
+)
+from utils.cache import SingleFlight, TTLCache
+from pydantic import ValidationError
+from functools import wraps
+import concurrent.futures
 import logging
+import os
+import uuid
 
 logger = logging.getLogger(__name__)
 
 demo_bp = Blueprint('demo', __name__)
 
+DEMO_ERROR_MESSAGE = 'Demo API error - contact samueldbrewer@gmail.com for support'
+
+# Fixed fields of every /manuals/process response, built once at import
+PROCESS_RESPONSE_METADATA = {
+    'processing_method': 'Direct PDF URL Processing with GPT-4.1-Nano',
+    'ai_model': 'gpt-4.1-nano-2025-04-14',
+    'extraction_source': 'Real-time AI extraction from PDF text',
+    'error_codes_format': 'Error Code Number, Short Error Description',
+    'part_numbers_format': 'OEM Part Number, Short Part Description'
+}
+
+def demo_safe(f):
+    """Turn unhandled exceptions in a demo endpoint into the standard demo error response"""
+    @wraps(f)
+    def decorated(*args, **kwargs):
+        try:
+            return f(*args, **kwargs)
+        except Exception as e:
+            logger.error("Demo %s error: %s", f.__name__, e)
+            return jsonify({
+                'error': str(e),
+                'message': DEMO_ERROR_MESSAGE
+            }), 500
+    return decorated
+
+def parse_demo_request(schema):
+    """
+    Parse and validate the JSON body against a demo request schema
+    
+    Returns:
+        tuple: (parsed request, None) or (None, 400 error response)
+    """
+    try:
+        return schema.model_validate_json(request.get_data()), None
+    except ValidationError as e:
+        return None, (jsonify(validation_error_body(schema, e)), 400)
+
+def validation_error_body(schema, error):
+    """
+    The 400 body for a failed validation: the schema's usual message when a
+    required field is missing or empty (or the body isn't a JSON object),
+    otherwise one naming the invalid field
+    """
+    loc = error.errors()[0]['loc']
+    field = loc[0] if loc else None
+    if field not in schema.model_fields or schema.model_fields[field].is_required():
+        return schema.error_body
+    return {'error': f'Invalid {field}'}
+
+def manual_search_result(make, model, manual_type, year):
+    """Search for manuals and format the demo response"""
+    results = search_manuals(make, model, manual_type, year)
+    return {
+        'make': make,
+        'model': model,
+        'year': year,
+        'type': manual_type,
+        'count': len(results),
+        'results': results
+    }
+
+# Demo evaluators tend to replay the same inputs, so successful upstream
+# lookups are reused for ten minutes
+demo_cache = TTLCache(maxsize=4096, ttl=600)
+
+def _cache_key(op, *values):
+    """Build a demo cache key that ignores case and surrounding whitespace"""
+    return (op,) + tuple(str(v).strip().lower() if v is not None else None for v in values)
+
+def _cached_call(key, func, **kwargs):
+    """Call func(**kwargs), reusing a cached successful result for the same key"""
+    result = demo_cache.get(key)
+    if result is None:
+        result = func(**kwargs)
+        # Failed or empty lookups are not cached so they get retried
+        if result.get('success') or result.get('count'):
+            demo_cache.set(key, result)
+    # Shallow copy so the watermark never lands on the cached dict
+    return dict(result)
+
+def cached_resolve_part_name(description, make=None, model=None, year=None, use_database=True,
+                             use_manual_search=True, use_web_search=True):
+    """resolve_part_name() for demos - never saves results, cached by normalized inputs"""
+    key = _cache_key('parts.resolve', description, make, model, year,
+                     use_database, use_manual_search, use_web_search)
+    return _cached_call(
+        key, resolve_part_name,
+        description=description, make=make, model=model, year=year,
+        use_database=use_database, use_manual_search=use_manual_search,
+        use_web_search=use_web_search,
+        save_results=False  # Don't save demo results
+    )
+
+def cached_find_suppliers(part_number, part_description='', make=None, model=None, oem_only=False, use_v2=True):
+    """find_suppliers() cached by normalized inputs"""
+    key = _cache_key('suppliers.search', part_number, part_description, make, model, oem_only, use_v2)
+    return _cached_call(
+        key, find_suppliers,
+        part_number=part_number, part_description=part_description,
+        make=make, model=model, oem_only=oem_only, use_v2=use_v2
+    )
+
+def cached_manual_search_result(make, model, manual_type, year):
+    """manual_search_result() cached by normalized inputs"""
+    key = _cache_key('manuals.search', make, model, manual_type, year)
+    return _cached_call(
+        key, manual_search_result,
+        make=make, model=model, manual_type=manual_type, year=year
+    )
+
 @demo_bp.route('/parts/resolve', methods=['POST'])
 @require_demo_key
+@demo_safe
 def demo_parts_resolve():
     """Demo version of parts resolution with watermarking"""
-    try:
-        data = request.json
-        
-        # Validate required fields
-        if 'description' not in data:
-            return jsonify({'error': 'Description is required'}), 400
-        
-        logger.info(f"Demo parts resolution for {g.demo_key_info['company']}: {data.get('description')}")
-        
-        # Call the actual API
-        result = resolve_part_name(
-            description=data['description'],
-            make=data.get('make'),
-            model=data.get('model'),
-            year=data.get('year'),
-            use_database=data.get('use_database', True),
-            use_manual_search=data.get('use_manual_search', True),
-            use_web_search=data.get('use_web_search', True),
-            save_results=False  # Don't save demo results
-        )
-        
-        # Add watermark
-        result = add_demo_watermark(result)
-        
-        return jsonify(result)
-        
-    except Exception as e:
-        logger.error(f"Demo parts resolution error: {e}")
-        return jsonify({
-            'error': str(e),
-            'message': 'Demo API error - contact samueldbrewer@gmail.com for support'
-        }), 500
+    req, error = parse_demo_request(PartsResolveRequest)
+    if error:
+        return error
+    
+    logger.info("Demo parts resolution for %s: %s", g.demo_key_info['company'], req.description)
+    
+    # Call the actual API
+    result = cached_resolve_part_name(
+        description=req.description,
+        make=req.make,
+        model=req.model,
+        year=req.year,
+        use_database=req.use_database,
+        use_manual_search=req.use_manual_search,
+        use_web_search=req.use_web_search
+    )
+    
+    # Add watermark
+    result = add_demo_watermark(result)
+    
+    return jsonify(result)
 
 @demo_bp.route('/suppliers/search', methods=['POST'])
-@require_demo_key  
+@require_demo_key
+@demo_safe
 def demo_supplier_search():
     """Demo version of supplier search with watermarking"""
-    try:
-        data = request.json
-        
-        # Validate required fields
-        if 'part_number' not in data:
-            return jsonify({'error': 'Part number is required'}), 400
-        
-        logger.info(f"Demo supplier search for {g.demo_key_info['company']}: {data.get('part_number')}")
-        
-        # Call the actual API
-        result = find_suppliers(
-            part_number=data['part_number'],
-            part_description=data.get('part_description', ''),
-            make=data.get('make'),
-            model=data.get('model'),
-            oem_only=data.get('oem_only', False),
-            use_v2=data.get('use_v2', True)
-        )
-        
-        # Add watermark
-        result = add_demo_watermark(result)
-        
-        return jsonify(result)
-        
-    except Exception as e:
-        logger.error(f"Demo supplier search error: {e}")
-        return jsonify({
-            'error': str(e),
-            'message': 'Demo API error - contact samueldbrewer@gmail.com for support'
-        }), 500
+    req, error = parse_demo_request(SupplierSearchRequest)
+    if error:
+        return error
+    
+    logger.info("Demo supplier search for %s: %s", g.demo_key_info['company'], req.part_number)
+    
+    # Call the actual API
+    result = cached_find_suppliers(
+        part_number=req.part_number,
+        part_description=req.part_description,
+        make=req.make,
+        model=req.model,
+        oem_only=req.oem_only,
+        use_v2=req.use_v2
+    )
+    
+    # Add watermark
+    result = add_demo_watermark(result)
+    
+    return jsonify(result)
 
 @demo_bp.route('/manuals/search', methods=['POST'])
 @require_demo_key
+@demo_safe
 def demo_manual_search():
     """Demo version of manual search with watermarking"""
+    req, error = parse_demo_request(ManualSearchRequest)
+    if error:
+        return error
+    
+    logger.info("Demo manual search for %s: %s %s", g.demo_key_info['company'], req.make, req.model)
+    
+    # Call the actual API
+    result = cached_manual_search_result(
+        req.make,
+        req.model,
+        req.manual_type,
+        req.year
+    )
+    
+    # Add watermark
+    result = add_demo_watermark(result)
+    
+    return jsonify(result)
+
+# Temp file removal runs here so responses don't wait on the unlink
+_cleanup_executor = concurrent.futures.ThreadPoolExecutor(max_workers=2)
+
+def _remove_temp_file(path):
+    """Delete a downloaded temp file, logging rather than raising on failure"""
     try:
-        data = request.json
-        
-        # Validate required fields
-        if not data.get('make') or not data.get('model'):
-            return jsonify({'error': 'Make and model are required'}), 400
-        
-        logger.info(f"Demo manual search for {g.demo_key_info['company']}: {data.get('make')} {data.get('model')}")
-        
-        # Call the actual API
-        results = search_manuals(
-            data['make'],
-            data['model'], 
-            data.get('manual_type', 'technical'),
-            data.get('year')
-        )
-        
-        # Format response
-        result = {
-            'make': data['make'],
-            'model': data['model'],
-            'year': data.get('year'),
-            'type': data.get('manual_type', 'technical'),
-            'count': len(results),
-            'results': results
-        }
-        
-        # Add watermark
-        result = add_demo_watermark(result)
-        
-        return jsonify(result)
-        
+        os.remove(path)
+        logger.info("Cleaned up temporary file: %s", path)
+    except FileNotFoundError:
+        pass
     except Exception as e:
-        logger.error(f"Demo manual search error: {e}")
-        return jsonify({
-            'error': str(e),
-            'message': 'Demo API error - contact samueldbrewer@gmail.com for support'
-        }), 500
+        logger.warning("Failed to clean up temp file %s: %s", path, e)
 
-@demo_bp.route('/manuals/process', methods=['POST'])
-@require_demo_key
-def demo_manual_process():
-    """Demo version of manual processing - accepts PDF URL and processes directly"""
+def process_pdf_url(pdf_url, make, model, timestamp=None):
+    """
+    Download a PDF, extract its text and run the AI extraction
+    
+    Returns:
+        dict: Demo /manuals/process result (without watermark)
+    """
+    from services.manual_finder import download_manual as download_manual_service
+    from services.manual_parser import detect_pdf_type, extract_text_cached, extract_information
+    
+    local_path = None
+    
     try:
-        data = request.json
-        
-        # Validate required fields
-        pdf_url = data.get('pdf_url')
-        make = data.get('make', 'Unknown')
-        model = data.get('model', 'Unknown')
-        
-        if not pdf_url:
-            return jsonify({
-                'error': 'pdf_url is required',
-                'message': 'Please provide a PDF URL to process'
-            }), 400
-        
-        logger.info(f"Demo manual processing for {g.demo_key_info['company']}: {pdf_url}")
-        
-        # Import required services
-        from services.manual_finder import download_manual as download_manual_service
-        from services.manual_parser import extract_text_from_pdf, extract_information
-        import os
-        
-        local_path = None
-        
-        try:
-            # Download PDF directly from URL
-            logger.info(f"Downloading PDF from: {pdf_url}")
-            local_path = download_manual_service(pdf_url)
-            logger.info(f"PDF downloaded to: {local_path}")
-            
-            # Check if file exists
-            if not os.path.exists(local_path):
-                raise Exception(f"Downloaded file not found at {local_path}")
-            
-            # Extract text from PDF
-            logger.info("Extracting text from PDF...")
-            text = extract_text_from_pdf(local_path)
-            logger.info(f"Extracted {len(text)} characters of text")
-            logger.info(f"Text preview (first 500 chars): {text[:500]}")
-            
-            # Check if we actually got meaningful text
-            if len(text.strip()) < 100:
-                logger.warning(f"Very little text extracted ({len(text)} chars), PDF might be image-based or corrupted")
-            
-            # Use AI to extract comprehensive information
-            logger.info("Processing with AI...")
-            extracted_info = extract_information(text)
-            logger.info(f"AI extraction results: {len(extracted_info.get('error_codes', []))} error codes, {len(extracted_info.get('part_numbers', []))} part numbers")
-            logger.info(f"Manual subject identified: {extracted_info.get('manual_subject', 'Unknown')}")
-            
-            # Build comprehensive response
-            result = {
-                'success': True,
-                'pdf_url': pdf_url,
-                'make': make,
-                'model': model,
-                'processing_method': 'Direct PDF URL Processing with GPT-4.1-Nano',
-                'ai_model': 'gpt-4.1-nano-2025-04-14',
-                'extraction_source': 'Real-time AI extraction from PDF text',
-                'manual_subject': extracted_info.get('manual_subject', 'Unknown'),
-                
-                # Error codes with structured format
-                'error_codes': extracted_info.get('error_codes', []),
-                'error_codes_count': len(extracted_info.get('error_codes', [])),
-                'error_codes_format': 'Error Code Number, Short Error Description',
-                
-                # Part numbers with structured format  
-                'part_numbers': extracted_info.get('part_numbers', []),
-                'part_numbers_count': len(extracted_info.get('part_numbers', [])),
-                'part_numbers_format': 'OEM Part Number, Short Part Description',
-                
-                # Additional extracted information
-                'common_problems': extracted_info.get('common_problems', []),
-                'maintenance_procedures': extracted_info.get('maintenance_procedures', []),
-                'safety_warnings': extracted_info.get('safety_warnings', []),
-                
-                'processing_timestamp': request.json.get('timestamp') or 'Not provided'
-            }
-            
-            logger.info(f"Successfully processed PDF: {len(result['error_codes'])} error codes, {len(result['part_numbers'])} part numbers")
-            
-        except Exception as e:
-            logger.error(f"PDF processing failed: {e}", exc_info=True)
-            result = {
+        # Download PDF directly from URL
+        logger.info("Downloading PDF from: %s", pdf_url)
+        local_path = download_manual_service(pdf_url)
+        logger.info("PDF downloaded to: %s", local_path)
+        
+        # Check if file exists
+        if not os.path.exists(local_path):
+            raise Exception(f"Downloaded file not found at {local_path}")
+        
+        # Scanned PDFs have no usable text layer, so don't spend an AI call on them.
+        # A sample can still land only on image pages, so confirm against the
+        # full text (cached for the extraction below) before giving up
+        pdf_info = detect_pdf_type(local_path)
+        if pdf_info['pdf_type'] == 'scanned':
+            pdf_info = detect_pdf_type(local_path, text=extract_text_cached(local_path))
+        if pdf_info['pdf_type'] == 'scanned':
+            logger.warning("PDF looks image-based (%s chars/page), skipping AI extraction", pdf_info['chars_per_page'])
+            return {
                 'success': False,
-                'error': str(e),
                 'pdf_url': pdf_url,
                 'make': make,
                 'model': model,
-                'processing_method': 'Direct PDF URL Processing with GPT-4.1-Nano',
-                'message': 'Failed to process PDF - check URL accessibility'
+                'pdf_type': 'scanned',
+                'chars_per_page': pdf_info['chars_per_page'],
+                'page_count': pdf_info['page_count'],
+                'processing_method': PROCESS_RESPONSE_METADATA['processing_method'],
+                'message': 'PDF appears to be scanned or image-based - no extractable text found'
             }
         
-        finally:
-            # Clean up temporary file
-            if local_path and os.path.exists(local_path):
-                try:
-                    os.remove(local_path)
-                    logger.info(f"Cleaned up temporary file: {local_path}")
-                except Exception as e:
-                    logger.warning(f"Failed to clean up temp file {local_path}: {e}")
+        # Extract text from PDF
+        logger.info("Extracting text from PDF...")
+        text = extract_text_cached(local_path)
+        logger.info("Extracted %s characters of text", len(text))
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Text preview (first 500 chars): %s", text[:500])
+        
+        # Use AI to extract comprehensive information
+        logger.info("Processing with AI...")
+        extracted_info = extract_information(text)
+        logger.info("AI extraction results: %s error codes, %s part numbers", len(extracted_info.get('error_codes', [])), len(extracted_info.get('part_numbers', [])))
+        logger.info("Manual subject identified: %s", extracted_info.get('manual_subject', 'Unknown'))
         
-        # Add watermark
-        result = add_demo_watermark(result)
+        # Build comprehensive response
+        result = {
+            'success': True,
+            'pdf_url': pdf_url,
+            'make': make,
+            'model': model,
+            'pdf_type': 'text',
+            **PROCESS_RESPONSE_METADATA,
+            'manual_subject': extracted_info.get('manual_subject', 'Unknown'),
+            
+            # Error codes with structured format
+            'error_codes': extracted_info.get('error_codes', []),
+            'error_codes_count': len(extracted_info.get('error_codes', [])),
+            
+            # Part numbers with structured format  
+            'part_numbers': extracted_info.get('part_numbers', []),
+            'part_numbers_count': len(extracted_info.get('part_numbers', [])),
+            
+            # Additional extracted information
+            'common_problems': extracted_info.get('common_problems', []),
+            'maintenance_procedures': extracted_info.get('maintenance_procedures', []),
+            'safety_warnings': extracted_info.get('safety_warnings', []),
+            
+            'processing_timestamp': timestamp or 'Not provided'
+        }
         
-        return jsonify(result)
+        logger.info("Successfully processed PDF: %s error codes, %s part numbers", len(result['error_codes']), len(result['part_numbers']))
+        return result
         
     except Exception as e:
-        logger.error(f"Demo manual processing error: {e}")
-        return jsonify({
+        logger.error("PDF processing failed: %s", e, exc_info=True)
+        return {
+            'success': False,
             'error': str(e),
-            'message': 'Demo API error - contact samueldbrewer@gmail.com for support'
-        }), 500
+            'pdf_url': pdf_url,
+            'make': make,
+            'model': model,
+            'processing_method': PROCESS_RESPONSE_METADATA['processing_method'],
+            'message': 'Failed to process PDF - check URL accessibility'
+        }
+    
+    finally:
+        # Clean up the temporary file off the response path
+        if local_path:
+            _cleanup_executor.submit(_remove_temp_file, local_path)
+
+# Identical PDF requests that arrive while one is running wait for its result
+# instead of downloading and extracting the same file again
+_inflight_processing = SingleFlight()
+
+def shared_process_pdf_url(pdf_url, make, model, timestamp=None):
+    """process_pdf_url() shared between concurrent identical requests"""
+    result = _inflight_processing.do(
+        (pdf_url, make, model, timestamp), process_pdf_url, pdf_url, make, model, timestamp
+    )
+    # Shallow copy so each caller can watermark its own response
+    return dict(result)
+
+# Background manual processing jobs, polled through /jobs/<job_id>
+demo_jobs = TTLCache(maxsize=1024, ttl=3600)
+_job_executor = concurrent.futures.ThreadPoolExecutor(max_workers=4)
+
+def _run_process_job(job, pdf_url, make, model, timestamp):
+    """Run process_pdf_url() for a background job and record the outcome"""
+    job['status'] = 'running'
+    try:
+        job['result'] = shared_process_pdf_url(pdf_url, make, model, timestamp)
+        job['status'] = 'completed'
+    except Exception as e:
+        logger.error("Demo job %s failed: %s", job['job_id'], e)
+        job['result'] = {'success': False, 'error': str(e)}
+        job['status'] = 'failed'
+
+@demo_bp.route('/manuals/process', methods=['POST'])
+@require_demo_key
+@demo_safe
+def demo_manual_process():
+    """
+    Demo version of manual processing - accepts PDF URL and processes directly
+    
+    With "background": true the PDF is processed off the request thread and a
+    job_id is returned immediately; poll /jobs/<job_id> for the result.
+    """
+    req, error = parse_demo_request(ManualProcessRequest)
+    if error:
+        return error
+    
+    logger.info("Demo manual processing for %s: %s", g.demo_key_info['company'], req.pdf_url)
+    
+    if req.background:
+        job_id = uuid.uuid4().hex
+        job = {
+            'job_id': job_id,
+            'demo_key': g.demo_key,
+            'status': 'queued',
+            'result': None
+        }
+        demo_jobs.set(job_id, job)
+        _job_executor.submit(_run_process_job, job, req.pdf_url, req.make, req.model, req.timestamp)
+        
+        result = add_demo_watermark({
+            'job_id': job_id,
+            'status': 'queued',
+            'status_url': f'/api/demo/jobs/{job_id}'
+        })
+        return jsonify(result), 202
+    
+    result = shared_process_pdf_url(req.pdf_url, req.make, req.model, req.timestamp)
+    
+    # Add watermark
+    result = add_demo_watermark(result)
+    
+    return jsonify(result)
+
+@demo_bp.route('/jobs/<job_id>', methods=['GET'])
+@require_demo_key
+@demo_safe
+def demo_job_status(job_id):
+    """Get the status, and once finished the result, of a background demo job"""
+    job = demo_jobs.get(job_id)
+    # Jobs are only visible to the key that created them
+    if job is None or job['demo_key'] != g.demo_key:
+        return jsonify({'error': 'Job not found'}), 404
+    
+    result = {'job_id': job_id, 'status': job['status']}
+    if job['result'] is not None:
+        result['result'] = job['result']
+    
+    # Add watermark
+    result = add_demo_watermark(result)
+    
+    return jsonify(result)
 
 
 @demo_bp.route('/enrichment/equipment', methods=['POST'])
 @require_demo_key
+@demo_safe
 def demo_equipment_enrichment():
     """Demo version of equipment enrichment with watermarking"""
-    try:
-        data = request.json
-        
-        # Validate required fields
-        if not data.get('make') or not data.get('model'):
-            return jsonify({'error': 'Make and model are required'}), 400
-        
-        logger.info(f"Demo equipment enrichment for {g.demo_key_info['company']}: {data.get('make')} {data.get('model')}")
-        
-        # Call the actual API
-        enrichment_service = EnrichmentService()
-        result = enrichment_service.get_enrichment_data(
-            make=data['make'],
-            model=data['model'],
-            year=data.get('year'),
-            part_number=None
-        )
-        
-        # Add watermark
-        result = add_demo_watermark(result)
-        
-        return jsonify(result)
-        
-    except Exception as e:
-        logger.error(f"Demo equipment enrichment error: {e}")
-        return jsonify({
-            'error': str(e),
-            'message': 'Demo API error - contact samueldbrewer@gmail.com for support'
-        }), 500
+    req, error = parse_demo_request(EquipmentEnrichmentRequest)
+    if error:
+        return error
+    
+    logger.info("Demo equipment enrichment for %s: %s %s", g.demo_key_info['company'], req.make, req.model)
+    
+    # Call the actual API
+    result = enrichment_service.get_enrichment_data(
+        make=req.make,
+        model=req.model,
+        year=req.year,
+        part_number=None
+    )
+    
+    # Add watermark
+    result = add_demo_watermark(result)
+    
+    return jsonify(result)
 
 @demo_bp.route('/enrichment/part', methods=['POST'])
 @require_demo_key
+@demo_safe
 def demo_part_enrichment():
     """Demo version of part enrichment with watermarking"""
+    req, error = parse_demo_request(PartEnrichmentRequest)
+    if error:
+        return error
+    
+    logger.info("Demo part enrichment for %s: %s", g.demo_key_info['company'], req.part_number)
+    
+    # Call the actual API
+    result = enrichment_service.get_enrichment_data(
+        make=req.make,
+        model=req.model,
+        year=None,
+        part_number=req.part_number
+    )
+    
+    # Add watermark
+    result = add_demo_watermark(result)
+    
+    return jsonify(result)
+
+def _batch_parts_resolve(req):
+    return cached_resolve_part_name(
+        description=req.description,
+        make=req.make,
+        model=req.model,
+        year=req.year,
+        use_database=req.use_database,
+        use_manual_search=req.use_manual_search,
+        use_web_search=req.use_web_search
+    )
+
+def _batch_supplier_search(req):
+    return cached_find_suppliers(
+        part_number=req.part_number,
+        part_description=req.part_description,
+        make=req.make,
+        model=req.model,
+        oem_only=req.oem_only,
+        use_v2=req.use_v2
+    )
+
+def _batch_manual_search(req):
+    return cached_manual_search_result(req.make, req.model, req.manual_type, req.year)
+
+# Operations accepted by /batch: op name -> (argument schema, handler)
+BATCH_OPERATIONS = {
+    'parts.resolve': (PartsResolveRequest, _batch_parts_resolve),
+    'suppliers.search': (SupplierSearchRequest, _batch_supplier_search),
+    'manuals.search': (ManualSearchRequest, _batch_manual_search)
+}
+
+BATCH_MAX_CALLS = 5
+
+# Shared pool so batch sub-calls run side by side instead of back to back
+_batch_executor = concurrent.futures.ThreadPoolExecutor(max_workers=8)
+
+def _run_batch_call(op, args):
+    """Run one batch sub-call, capturing failures in its own result slot"""
+    schema, handler = BATCH_OPERATIONS[op]
     try:
-        data = request.json
-        
-        # Validate required fields
-        if not data.get('part_number'):
-            return jsonify({'error': 'Part number is required'}), 400
-        
-        logger.info(f"Demo part enrichment for {g.demo_key_info['company']}: {data.get('part_number')}")
-        
-        # Build enrichment query
-        make = data.get('make', '')
-        model = data.get('model', '')
-        part_number = data['part_number']
-        description = data.get('description', '')
-        
-        query = f"{make} {model} {part_number} {description}".strip()
-        
-        # Call the actual API
-        enrichment_service = EnrichmentService()
-        result = enrichment_service.get_enrichment_data(
-            make=make,
-            model=model,
-            year=None,
-            part_number=part_number
-        )
-        
-        # Add watermark
-        result = add_demo_watermark(result)
-        
-        return jsonify(result)
-        
+        req = schema.model_validate(args)
+    except ValidationError as e:
+        return {'op': op, 'success': False, 'error': validation_error_body(schema, e)['error']}
+    try:
+        return {'op': op, 'success': True, 'result': handler(req)}
     except Exception as e:
-        logger.error(f"Demo part enrichment error: {e}")
-        return jsonify({
-            'error': str(e),
-            'message': 'Demo API error - contact samueldbrewer@gmail.com for support'
-        }), 500
+        logger.error("Demo batch %s error: %s", op, e)
+        return {'op': op, 'success': False, 'error': str(e)}
+
+@demo_bp.route('/batch', methods=['POST'])
+@require_demo_key
+@demo_safe
+def demo_batch():
+    """
+    Run several demo operations concurrently in one request
+    
+    Request format:
+    {
+        "calls": [
+            {"op": "parts.resolve", "args": {"description": "...", "make": "...", "model": "..."}},
+            {"op": "suppliers.search", "args": {"part_number": "..."}},
+            {"op": "manuals.search", "args": {"make": "...", "model": "..."}}
+        ]
+    }
+    """
+    req, error = parse_demo_request(BatchRequest)
+    if error:
+        return error
+    calls = req.calls
+    
+    # Validate the call list
+    if len(calls) > BATCH_MAX_CALLS:
+        return jsonify({'error': f'Maximum of {BATCH_MAX_CALLS} calls allowed'}), 400
+    
+    for call in calls:
+        if call.op not in BATCH_OPERATIONS:
+            return jsonify({
+                'error': 'Each call needs an op from: ' + ', '.join(BATCH_OPERATIONS)
+            }), 400
+    
+    # Each sub-call counts as one use; require_demo_key already charged the first
+    if not charge_demo_usage(g.demo_key_info, len(calls) - 1):
+        logger.info("Demo usage limit exceeded by batch: %s", g.demo_key_info['company'])
+        g.demo_key_info['current_usage'] -= 1  # A rejected batch costs nothing
+        return jsonify(USAGE_LIMIT_EXCEEDED), 429
+    
+    logger.info("Demo batch for %s: %s", g.demo_key_info['company'], [call.op for call in calls])
+    
+    # Latency is the slowest sub-call rather than the sum of all of them
+    futures = [
+        _batch_executor.submit(_run_batch_call, call.op, call.args)
+        for call in calls
+    ]
+    result = {
+        'count': len(futures),
+        'results': [future.result() for future in futures]
+    }
+    
+    # Add watermark once for the whole batch
+    result = add_demo_watermark(result)
+    
+    return jsonify(result)
 
 @demo_bp.route('/status', methods=['GET'])
 @require_demo_key
 def demo_status():
     """Get demo status and usage information"""
     try:
-        return jsonify({
-            'demo_active': True,
-            'company': g.demo_key_info['company'],
-            'usage': f"{g.demo_key_info['current_usage']}/{g.demo_key_info['usage_limit']}",
-            'expires': g.demo_key_info['expires'].isoformat(),
-            'contact_sales': 'samueldbrewer@gmail.com'
-        })
+        return jsonify(demo_status_payload(g.demo_key_info))
     except Exception as e:
-        logger.error(f"Demo status error: {e}")
+        logger.error("Demo status error: %s", e)
         return jsonify({'error': str(e)}), 500
\ No newline at end of file
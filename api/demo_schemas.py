@@ -0,0 +1,84 @@
+"""
+Request schemas for the demo API endpoints
+Bodies are parsed and validated in one step with pydantic
+"""
+
+from typing import Any, ClassVar, Dict, List, Optional, Union
+from pydantic import BaseModel, Field
+from utils.validation import NumericStr
+
+# Years arrive as either numbers or strings depending on the client
+Year = Optional[Union[int, str]]
+
+
+class PartsResolveRequest(BaseModel):
+    error_body: ClassVar[dict] = {'error': 'Description is required'}
+
+    description: str
+    make: Optional[NumericStr] = None
+    model: Optional[NumericStr] = None
+    year: Year = None
+    use_database: bool = True
+    use_manual_search: bool = True
+    use_web_search: bool = True
+
+
+class SupplierSearchRequest(BaseModel):
+    error_body: ClassVar[dict] = {'error': 'Part number is required'}
+
+    part_number: NumericStr
+    part_description: Optional[str] = ''
+    make: Optional[NumericStr] = None
+    model: Optional[NumericStr] = None
+    oem_only: bool = False
+    use_v2: bool = True
+
+
+class ManualSearchRequest(BaseModel):
+    error_body: ClassVar[dict] = {'error': 'Make and model are required'}
+
+    make: NumericStr = Field(min_length=1)
+    model: NumericStr = Field(min_length=1)
+    manual_type: Optional[str] = 'technical'
+    year: Year = None
+
+
+class ManualProcessRequest(BaseModel):
+    error_body: ClassVar[dict] = {
+        'error': 'pdf_url is required',
+        'message': 'Please provide a PDF URL to process'
+    }
+
+    pdf_url: str = Field(min_length=1)
+    make: Optional[NumericStr] = 'Unknown'
+    model: Optional[NumericStr] = 'Unknown'
+    timestamp: Optional[str] = None
+    background: bool = False
+
+
+class EquipmentEnrichmentRequest(BaseModel):
+    error_body: ClassVar[dict] = {'error': 'Make and model are required'}
+
+    make: NumericStr = Field(min_length=1)
+    model: NumericStr = Field(min_length=1)
+    year: Year = None
+
+
+class PartEnrichmentRequest(BaseModel):
+    error_body: ClassVar[dict] = {'error': 'Part number is required'}
+
+    part_number: NumericStr = Field(min_length=1)
+    make: Optional[NumericStr] = ''
+    model: Optional[NumericStr] = ''
+    description: Optional[str] = ''
+
+
+class BatchCall(BaseModel):
+    op: str
+    args: Dict[str, Any] = {}
+
+
+class BatchRequest(BaseModel):
+    error_body: ClassVar[dict] = {'error': 'calls must be a non-empty list'}
+
+    calls: List[BatchCall] = Field(min_length=1)
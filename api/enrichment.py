@@ -1,9 +1,10 @@
 from flask import Blueprint, request, jsonify, current_app
 from services.enrichment_service import EnrichmentService
+from pydantic import BaseModel, Field, ValidationError
+from typing import Optional, Union
+from utils.validation import NumericStr
 import logging
 
-# Set up logging
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 # Initialize the blueprint
@@ -12,6 +13,13 @@ enrichment_bp = Blueprint('enrichment', __name__)
 # Initialize the enrichment service
 enrichment_service = EnrichmentService()
 
+class EnrichmentRequest(BaseModel):
+    """Enrichment request body, parsed and validated in one pass"""
+    make: NumericStr = Field(min_length=1)
+    model: NumericStr = Field(min_length=1)
+    year: Optional[Union[int, str]] = None
+    part_number: Optional[Union[str, int]] = None
+
 @enrichment_bp.route('', methods=['POST'])
 def get_enrichment_data():
     """
@@ -27,24 +35,23 @@ def get_enrichment_data():
         JSON with videos, articles, and images related to the vehicle or part
     """
     try:
-        # Get request data
-        data = request.json
-        
-        # Validate required fields
-        if 'make' not in data or not data['make']:
-            return jsonify({'error': 'Make is required'}), 400
-            
-        if 'model' not in data or not data['model']:
-            return jsonify({'error': 'Model is required'}), 400
+        # Parse and validate the request body
+        try:
+            req = EnrichmentRequest.model_validate_json(request.get_data())
+        except ValidationError as e:
+            loc = e.errors()[0]['loc']
+            field = loc[0] if loc else 'make'
+            if field in ('make', 'model'):
+                return jsonify({'error': f'{field.capitalize()} is required'}), 400
+            return jsonify({'error': f'Invalid {field}'}), 400
         
-        # Extract optional fields
-        make = data['make']
-        model = data['model']
-        year = data.get('year')
-        part_number = data.get('part_number')
+        make = req.make
+        model = req.model
+        year = req.year
+        part_number = req.part_number
         
         # Log the request
-        logger.info(f"Enrichment request for {make} {model} {year if year else ''} {part_number if part_number else ''}")
+        logger.info("Enrichment request for %s %s %s %s", make, model, year or '', part_number or '')
         
         # Get enrichment data
         result = enrichment_service.get_enrichment_data(
@@ -73,7 +80,7 @@ def get_enrichment_data():
         })
         
     except Exception as e:
-        logger.error(f"Error processing enrichment request: {e}")
+        logger.error("Error processing enrichment request: %s", e)
         return jsonify({
             'success': False,
             'error': str(e)
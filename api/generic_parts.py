@@ -1,12 +1,26 @@
-from flask import Blueprint, request, jsonify
-import requests
+from flask import Blueprint, Response, request, jsonify, stream_with_context
 import json
 import os
 import logging
-from typing import Dict, List, Optional
+import concurrent.futures
+import threading
+import uuid
+from typing import Dict, List, Optional, Tuple
+from utils.cache import TTLCache
+from utils.http import HTTP_SESSION
+from utils.rate_limit import RateLimitFilter
+
+# Imported once here rather than inside the request path; the app still starts
+# without the package and simply skips AI analysis
+try:
+    import openai
+except ImportError:
+    openai = None
 
 # Set up logging first
 logger = logging.getLogger(__name__)
+# SerpAPI quota errors arrive in bursts, one per query; keep them from flooding the log
+logger.addFilter(RateLimitFilter(max_per_second=10))
 
 # Initialize OpenAI client - defer initialization to avoid startup errors
 openai_client = None
@@ -22,9 +36,8 @@ def get_openai_client():
                 logger.warning("OpenAI API key not configured")
                 return None
             
-            # Try to import using new OpenAI Python client (v1.0.0+)
-            from openai import OpenAI
-            openai_client = OpenAI(api_key=api_key)
+            # Use the new OpenAI Python client (v1.0.0+)
+            openai_client = openai.OpenAI(api_key=api_key)
             logger.info("OpenAI client initialized successfully")
         except Exception as e:
             logger.error(f"Failed to initialize OpenAI client: {e}")
@@ -32,12 +45,201 @@ def get_openai_client():
     
     return openai_client
 
+# Fixed instructions for the compatibility analysis. Kept identical across calls
+# and placed first so repeated requests hit the provider's prompt cache.
+COMPATIBILITY_SYSTEM_PROMPT = """You are an expert in automotive and industrial parts cross-referencing. Analyze search results to find compatible generic alternatives to OEM parts with comprehensive analysis.
+
+You are an expert parts analyst with access to comprehensive search results. The user message gives the OEM part information followed by the search results, one per line as index|title|url|snippet. Analyze these results to find generic/aftermarket alternatives for the OEM part using GPT-4.1-Nano's enhanced analytical capabilities.
+
+Using GPT-4.1-Nano's advanced reasoning capabilities, perform a deep analysis to extract generic/aftermarket alternatives. For each alternative, provide detailed information:
+
+Required Fields:
+1. "generic_part_number": Exact part number if found
+2. "generic_part_description": Detailed description of the generic part
+3. "manufacturer": Brand/manufacturer of the generic part
+4. "compatibility_notes": Specific compatibility information with the OEM part
+5. "price_information": Price details if available (include currency and source)
+6. "confidence_score": Integer from 1-10 based on compatibility evidence
+7. "key_features": Array of key specifications and features
+8. "source_website": Website URL where this part was found
+9. "cross_reference_evidence": Specific evidence supporting compatibility
+10. "dimensional_specs": Physical dimensions if mentioned
+11. "electrical_specs": Electrical specifications if applicable
+12. "material_composition": Materials used in construction if mentioned
+
+Analysis Criteria (GPT-4.1-Nano Enhanced):
+✅ INCLUDE:
+- Direct OEM cross-references with documented compatibility
+- Aftermarket brands (Dorman, Beck/Arnley, Febi, Genuine, etc.)
+- Universal/compatible parts with clear fitment data
+- Parts with specific make/model compatibility lists
+- Cross-reference charts and compatibility tables
+- Parts with identical specifications and mounting requirements
+
+❌ EXCLUDE:
+- Original OEM parts from the same manufacturer
+- Completely unrelated automotive/industrial parts
+- Parts for different equipment categories
+- Vague compatibility claims without evidence
+- Parts with conflicting specifications
+
+Enhanced Analysis Instructions:
+- Leverage the full context to cross-reference information across multiple sources
+- Look for patterns in part numbering systems that indicate compatibility
+- Identify aftermarket manufacturers known for quality cross-references
+- Pay special attention to electrical specifications, dimensions, and mounting details
+- Consider application-specific requirements (temperature, pressure, etc.)
+- Validate compatibility claims by checking multiple sources when possible
+
+Return ONLY a valid JSON object of the form {"alternatives": [...]}, where the array holds one entry per part with detailed analysis. Each part entry should be thoroughly researched and validated using the comprehensive search results provided. Use GPT-4.1-Nano's enhanced analytical capabilities with 1M input token capacity to provide the most accurate and detailed compatibility assessment possible."""
+
 generic_parts_bp = Blueprint('generic_parts', __name__)
 
+# SerpAPI queries are network-bound, so a request's queries run side by side
+# on this shared pool instead of one after another
+search_executor = concurrent.futures.ThreadPoolExecutor(max_workers=16)
+
+SERPAPI_SEARCH_URL = 'https://serpapi.com/search'
+# (connect, read) seconds; a stuck scrape is dropped rather than holding the request
+SERPAPI_TIMEOUT = (5, 20)
+
+# Google ORs the near-duplicate phrasings together, so one query with more
+# results returns the same links as several narrow ones for a fraction of the
+# SerpAPI calls. Set GENERIC_SEARCH_COMBINED_QUERIES=0 to go back to the
+# individual queries.
+COMBINED_QUERIES = os.environ.get('GENERIC_SEARCH_COMBINED_QUERIES', '1').lower() not in ('0', 'false', 'no')
+RESULTS_PER_QUERY = 20 if COMBINED_QUERIES else 5
+# Ask SerpAPI to return only the fields we read, so responses stay a few KB
+# instead of the full SERP page with ads, metadata and related searches
+ORGANIC_RESULTS_RESTRICTOR = 'organic_results[].{title,link,snippet}'
+IMAGE_RESULTS_RESTRICTOR = 'images_results[0:1].{original}'
+
+# Search results whose title+snippet words overlap more than this are treated as repeats
+NEAR_DUPLICATE_SIMILARITY = 0.85
+MAX_SNIPPET_CHARS = 280
+MAX_TITLE_CHARS = 120
+# With fewer results than this there is nothing for the AI to cross-reference
+MIN_SEARCH_RESULTS = 2
+
+# A JSON array of ~10 parts is ~1.5K tokens; asking for far more only makes the
+# provider reserve capacity we never use
+BASE_COMPLETION_TOKENS = 2048
+TOKENS_PER_RESULT = 200
+MAX_COMPLETION_TOKENS = 8192
+
+def _completion_token_budget(options: Dict) -> int:
+    """max_tokens for the compatibility analysis, scaled by the requested max_results"""
+    try:
+        max_results = int(options.get('max_results', 10))
+    except (TypeError, ValueError):
+        max_results = 10
+    return min(BASE_COMPLETION_TOKENS + TOKENS_PER_RESULT * max(max_results, 0), MAX_COMPLETION_TOKENS)
+
+def _jaccard(a: set, b: set) -> float:
+    """Jaccard similarity of two word sets"""
+    if not a or not b:
+        return 0.0
+    return len(a & b) / len(a | b)
+
+def _prompt_field(value: str) -> str:
+    """Flatten a search result field onto one line without the | delimiter"""
+    return ' '.join(value.replace('|', '/').split())
+
+def _iter_json_array_items(chunks, key: str = 'alternatives'):
+    """
+    Yield each object of the result array in a stream of text chunks as soon
+    as its closing brace arrives, using a bracket counter that skips brackets
+    inside strings. The array is either the whole document (possibly wrapped
+    in prose) or the value of `key` in a top-level object; nested arrays and
+    text around the document are ignored.
+    """
+    depth = 0
+    top = None
+    item_depth = None
+    buffer = []
+    key_chars = None
+    last_key = None
+    in_string = escaped = False
+    for chunk in chunks:
+        for ch in chunk:
+            if buffer:
+                buffer.append(ch)
+            if in_string:
+                if escaped:
+                    escaped = False
+                elif ch == '\\':
+                    escaped = True
+                elif ch == '"':
+                    in_string = False
+                    if key_chars is not None:
+                        # The last string read at the top level before a
+                        # value is that value's key
+                        last_key = ''.join(key_chars)
+                        key_chars = None
+                    continue
+                if key_chars is not None:
+                    key_chars.append(ch)
+                continue
+            if ch == '"':
+                in_string = depth > 0
+                if depth == 1 and top == '{':
+                    key_chars = []
+            elif ch in '[{':
+                depth += 1
+                if depth == 1:
+                    top = ch
+                    if ch == '[':
+                        item_depth = 2
+                elif ch == '[' and depth == 2 and top == '{' and last_key == key and item_depth is None:
+                    item_depth = 3
+                elif ch == '{' and depth == item_depth and not buffer:
+                    buffer.append(ch)
+            elif ch in ']}':
+                if buffer and depth == item_depth:
+                    item = ''.join(buffer)
+                    buffer = []
+                    try:
+                        yield json.loads(item)
+                    except json.JSONDecodeError as e:
+                        logger.warning("Skipping malformed streamed item: %s", e)
+                depth -= 1
+                if depth <= 0 or (item_depth is not None and depth < item_depth - 1):
+                    return
+
+def _parse_alternatives(ai_response: str) -> List[Dict]:
+    """
+    Read the alternatives out of a compatibility response. JSON mode returns
+    {"alternatives": [...]} (occasionally under another key); legacy
+    completions may wrap a bare array in prose, so fall back to the bracket
+    counter rather than a regex.
+    """
+    try:
+        parsed = json.loads(ai_response)
+    except (TypeError, json.JSONDecodeError):
+        return list(_iter_json_array_items([ai_response or '']))
+    
+    if isinstance(parsed, dict):
+        # The model sometimes picks its own key ({"parts": [...]}), so take
+        # the first list when "alternatives" is missing
+        alternatives = parsed.get('alternatives')
+        if not isinstance(alternatives, list):
+            alternatives = next((value for value in parsed.values() if isinstance(value, list)), [])
+        parsed = alternatives
+    if not isinstance(parsed, list):
+        return []
+    return [r for r in parsed if isinstance(r, dict)]
+
 class GenericPartsFinder:
     def __init__(self):
         self.serpapi_key = os.getenv('SERPAPI_KEY')
         # Don't initialize OpenAI client here - use get_openai_client() when needed
+        
+        # Organic results per normalized query; common OEM numbers recur across requests
+        self.search_cache = TTLCache(maxsize=4096, ttl=3600)
+        self.search_cache_stats = {'hits': 0, 'misses': 0}
+        # Image URL per normalized google_images query ('' when nothing was found)
+        self.image_cache = TTLCache(maxsize=4096, ttl=86400)
+        self._stats_lock = threading.Lock()
     
     def find_generic_alternatives(self, make: str, model: str, oem_part_number: str, 
                                 oem_part_description: str, options: Dict = None) -> Dict:
@@ -48,16 +250,17 @@ class GenericPartsFinder:
             options = {}
         
         try:
-            # Step 1: Search for cross-reference information
-            cross_ref_results = self._search_cross_references(oem_part_number, make, model)
-            
-            # Step 2: Search for generic/aftermarket alternatives  
-            generic_results = self._search_generic_parts(oem_part_description, make, model, oem_part_number)
+            # Steps 1 and 2: Search for cross-reference information and for
+            # generic/aftermarket alternatives at the same time
+            search_results = self._serp_search_many(
+                self._search_queries(oem_part_number, oem_part_description, make, model)
+            )
+            cross_ref_count = sum(r['search_type'] == 'cross_reference' for r in search_results)
             
             # Step 3: Use AI to analyze and validate compatibility
             analyzed_results = self._analyze_compatibility(
                 oem_part_number, oem_part_description, make, model, 
-                cross_ref_results + generic_results, options
+                search_results, options
             )
             
             # Step 4: Enhance with additional details and photos
@@ -73,8 +276,8 @@ class GenericPartsFinder:
                 },
                 'generic_alternatives': enhanced_results,
                 'search_metadata': {
-                    'cross_references_found': len(cross_ref_results),
-                    'generic_parts_found': len(generic_results),
+                    'cross_references_found': cross_ref_count,
+                    'generic_parts_found': len(search_results) - cross_ref_count,
                     'ai_validated': len([r for r in enhanced_results if r.get('ai_validated')])
                 }
             }
@@ -91,151 +294,228 @@ class GenericPartsFinder:
                 }
             }
     
-    def _search_cross_references(self, oem_part_number: str, make: str, model: str) -> List[Dict]:
-        """Search for cross-reference parts using SerpAPI"""
-        search_queries = [
+    def stream_generic_alternatives(self, make: str, model: str, oem_part_number: str,
+                                    oem_part_description: str, options: Dict = None):
+        """
+        Generate newline-delimited JSON for find_generic_alternatives: one
+        "alternative" line per part as the AI produces it, then a "done" line
+        """
+        if options is None:
+            options = {}
+        
+        oem_reference = {
+            'part_number': oem_part_number,
+            'description': oem_part_description,
+            'make': make,
+            'model': model
+        }
+        try:
+            search_results = self._serp_search_many(
+                self._search_queries(oem_part_number, oem_part_description, make, model)
+            )
+            cross_ref_count = sum(r['search_type'] == 'cross_reference' for r in search_results)
+            
+            ai_validated = 0
+            for part in self._stream_compatibility(
+                oem_part_number, oem_part_description, make, model,
+                search_results, options
+            ):
+                enhanced = self._enhance_part_details([part])[0]
+                ai_validated += 1
+                yield json.dumps({'type': 'alternative', 'part': enhanced}) + '\n'
+            
+            yield json.dumps({
+                'type': 'done',
+                'success': True,
+                'oem_reference': oem_reference,
+                'search_metadata': {
+                    'cross_references_found': cross_ref_count,
+                    'generic_parts_found': len(search_results) - cross_ref_count,
+                    'ai_validated': ai_validated
+                }
+            }) + '\n'
+            
+        except Exception as e:
+            logger.error("Error streaming generic alternatives: %s", e)
+            yield json.dumps({
+                'type': 'error',
+                'success': False,
+                'error': str(e),
+                'oem_reference': oem_reference
+            }) + '\n'
+    
+    def _search_queries(self, oem_part_number: str, oem_part_description: str,
+                        make: str, model: str) -> List[Tuple[str, str]]:
+        """Every (query, search_type) pair for a lookup, cross-references first"""
+        return [
+            (query, 'cross_reference')
+            for query in self._cross_reference_queries(oem_part_number, make, model)
+        ] + [
+            (query, 'generic_search')
+            for query in self._generic_part_queries(oem_part_description, make, model)
+        ]
+    
+    def _serp_search_many(self, queries: List[Tuple[str, str]]) -> List[Dict]:
+        """
+        Run all (query, search_type) searches concurrently and merge their
+        results in query order, keeping only the first result for each link
+        """
+        futures = [
+            search_executor.submit(self._serp_query, query, search_type)
+            for query, search_type in queries
+        ]
+        
+        seen_links = set()
+        merged = []
+        for future in futures:
+            for result in future.result():
+                link = result['link']
+                if link:
+                    if link in seen_links:
+                        continue
+                    seen_links.add(link)
+                merged.append(result)
+        return merged
+    
+    def _cross_reference_queries(self, oem_part_number: str, make: str, model: str) -> List[str]:
+        """Queries used to find cross-reference parts"""
+        if COMBINED_QUERIES:
+            return [
+                f'{oem_part_number} ("cross reference" OR compatible OR interchange) {make} {model}',
+                f"{oem_part_number} (aftermarket OR generic OR equivalent OR replacement)"
+            ]
+        return [
             f"{oem_part_number} cross reference {make}",
             f"{oem_part_number} compatible parts {make} {model}",
             f"{oem_part_number} aftermarket replacement",
             f"{oem_part_number} generic equivalent"
         ]
-        
-        all_results = []
-        
-        for query in search_queries:
-            try:
-                params = {
-                    'engine': 'google',
-                    'q': query,
-                    'api_key': self.serpapi_key,
-                    'num': 5
-                }
-                
-                response = requests.get('https://serpapi.com/search', params=params)
-                if response.status_code == 200:
-                    data = response.json()
-                    results = data.get('organic_results', [])
-                    
-                    for result in results:
-                        all_results.append({
-                            'title': result.get('title', ''),
-                            'link': result.get('link', ''),
-                            'snippet': result.get('snippet', ''),
-                            'search_type': 'cross_reference',
-                            'query': query
-                        })
-                        
-            except Exception as e:
-                print(f"Error in cross-reference search: {e}")
-                continue
-        
-        return all_results
     
-    def _search_generic_parts(self, part_description: str, make: str, model: str, oem_part: str) -> List[Dict]:
-        """Search for generic parts using SerpAPI"""
-        search_queries = [
+    def _generic_part_queries(self, part_description: str, make: str, model: str) -> List[str]:
+        """Queries used to find generic parts"""
+        if COMBINED_QUERIES:
+            return [
+                f"{part_description} (aftermarket OR generic OR universal OR compatible OR replacement) {make} {model}"
+            ]
+        return [
             f"{part_description} {make} {model} aftermarket",
             f"{part_description} {make} generic replacement",
             f"{part_description} compatible {make} {model}",
             f"aftermarket {part_description} {make}",
             f"universal {part_description} {make} {model}"
         ]
+    
+    def _serp_query(self, query: str, search_type: str) -> List[Dict]:
+        """Run one SerpAPI Google search and tag its organic results"""
+        results = self._cached_organic_results(query)
+        return [{
+            'title': result.get('title', ''),
+            'link': result.get('link', ''),
+            'snippet': result.get('snippet', ''),
+            'search_type': search_type,
+            'query': query
+        } for result in results]
+    
+    def _cached_organic_results(self, query: str) -> List[Dict]:
+        """Organic results for a Google query, served from the search cache when possible"""
+        key = ('google', query.strip().lower())
+        results = self.search_cache.get(key)
+        with self._stats_lock:
+            self.search_cache_stats['hits' if results is not None else 'misses'] += 1
+        if results is not None:
+            return results
         
-        all_results = []
-        
-        for query in search_queries:
-            try:
-                params = {
-                    'engine': 'google',
-                    'q': query,
-                    'api_key': self.serpapi_key,
-                    'num': 5
-                }
+        try:
+            params = {
+                'engine': 'google',
+                'q': query,
+                'api_key': self.serpapi_key,
+                'num': RESULTS_PER_QUERY,
+                'json_restrictor': ORGANIC_RESULTS_RESTRICTOR
+            }
+            
+            response = HTTP_SESSION.get(SERPAPI_SEARCH_URL, params=params, timeout=SERPAPI_TIMEOUT)
+            if response.status_code == 200:
+                data = response.json()
+                results = [{
+                    'title': result.get('title', ''),
+                    'link': result.get('link', ''),
+                    'snippet': result.get('snippet', '')
+                } for result in data.get('organic_results', [])]
+                # Failed calls are not cached so they get retried
+                self.search_cache.set(key, results)
+                return results
                 
-                response = requests.get('https://serpapi.com/search', params=params)
-                if response.status_code == 200:
-                    data = response.json()
-                    results = data.get('organic_results', [])
-                    
-                    for result in results:
-                        all_results.append({
-                            'title': result.get('title', ''),
-                            'link': result.get('link', ''),
-                            'snippet': result.get('snippet', ''),
-                            'search_type': 'generic_search',
-                            'query': query
-                        })
-                        
-            except Exception as e:
-                print(f"Error in generic parts search: {e}")
+        except Exception as e:
+            logger.warning("Error in search for '%s': %s", query, e)
+        
+        return []
+    
+    def _prepare_search_results(self, search_results: List[Dict]) -> List[Dict]:
+        """
+        Drop repeated and near-duplicate results and trim snippets for the AI prompt
+        
+        Cross-reference results are kept ahead of generic search results.
+        """
+        ordered = sorted(search_results, key=lambda r: r.get('search_type') != 'cross_reference')
+        
+        prepared = []
+        seen_links = set()
+        seen_word_sets = []
+        for result in ordered:
+            link = result.get('link', '')
+            if link and link in seen_links:
+                continue
+            
+            words = set(f"{result.get('title', '')} {result.get('snippet', '')}".lower().split())
+            if any(_jaccard(words, other) > NEAR_DUPLICATE_SIMILARITY for other in seen_word_sets):
                 continue
+            
+            seen_links.add(link)
+            seen_word_sets.append(words)
+            snippet = result.get('snippet', '')
+            if len(snippet) > MAX_SNIPPET_CHARS:
+                result = {**result, 'snippet': snippet[:MAX_SNIPPET_CHARS]}
+            prepared.append(result)
         
-        return all_results
+        return prepared
+    
+    def _compatibility_prompt(self, oem_part: str, oem_description: str, make: str,
+                              model: str, search_results: List[Dict]) -> str:
+        """Build the per-request user message for the compatibility analysis"""
+        # Prepare search results for AI analysis - overlapping queries return
+        # many of the same pages, so repeats are dropped before billing tokens
+        search_results = self._prepare_search_results(search_results)
+        # One compact index|title|url|snippet line per result; the format is
+        # described once in the system prompt instead of labelled per field
+        results_text = "\n".join(
+            f"{i}|{_prompt_field(r.get('title', ''))[:MAX_TITLE_CHARS]}|{r.get('link', '')}|{_prompt_field(r.get('snippet', ''))}"
+            for i, r in enumerate(search_results)
+        )
+        
+        # Only the OEM details and search results change between calls; the
+        # fixed instructions live in the system message so the provider can
+        # reuse its cached prompt prefix
+        prompt = f"""OEM Part Information:
+- Part Number: {oem_part}
+- Description: {oem_description}
+- Make: {make}
+- Model: {model}
+
+Search Results (Comprehensive Analysis):
+{results_text}
+"""
+        return prompt
     
     def _analyze_compatibility(self, oem_part: str, oem_description: str, make: str, 
                              model: str, search_results: List[Dict], options: Dict) -> List[Dict]:
         """Use AI to analyze compatibility and extract part information"""
+        if len(search_results) < MIN_SEARCH_RESULTS:
+            logger.info("Only %d search results for %s - skipping AI analysis", len(search_results), oem_part)
+            return []
         
-        # Prepare search results for AI analysis - GPT-4.1-Nano can handle up to 1M input tokens
-        results_text = "\n".join([
-            f"Title: {r.get('title', '')}\nURL: {r.get('link', '')}\nDescription: {r.get('snippet', '')}\nSearch Type: {r.get('search_type', '')}\n---"
-            for r in search_results  # Process all results with GPT-4.1-Nano's large input context
-        ])
-        
-        prompt = f"""
-        You are an expert parts analyst with access to comprehensive search results. Analyze these results to find generic/aftermarket alternatives for an OEM part using GPT-4.1-Nano's enhanced analytical capabilities.
-
-        OEM Part Information:
-        - Part Number: {oem_part}
-        - Description: {oem_description}
-        - Make: {make}
-        - Model: {model}
-
-        Search Results (Comprehensive Analysis):
-        {results_text}
-
-        Using GPT-4.1-Nano's advanced reasoning capabilities, perform a deep analysis to extract generic/aftermarket alternatives. For each alternative, provide detailed information:
-
-        Required Fields:
-        1. "generic_part_number": Exact part number if found
-        2. "generic_part_description": Detailed description of the generic part
-        3. "manufacturer": Brand/manufacturer of the generic part
-        4. "compatibility_notes": Specific compatibility information with the OEM part
-        5. "price_information": Price details if available (include currency and source)
-        6. "confidence_score": Integer from 1-10 based on compatibility evidence
-        7. "key_features": Array of key specifications and features
-        8. "source_website": Website URL where this part was found
-        9. "cross_reference_evidence": Specific evidence supporting compatibility
-        10. "dimensional_specs": Physical dimensions if mentioned
-        11. "electrical_specs": Electrical specifications if applicable
-        12. "material_composition": Materials used in construction if mentioned
-
-        Analysis Criteria (GPT-4.1-Nano Enhanced):
-        ✅ INCLUDE:
-        - Direct OEM cross-references with documented compatibility
-        - Aftermarket brands (Dorman, Beck/Arnley, Febi, Genuine, etc.)
-        - Universal/compatible parts with clear fitment data
-        - Parts with specific make/model compatibility lists
-        - Cross-reference charts and compatibility tables
-        - Parts with identical specifications and mounting requirements
-
-        ❌ EXCLUDE:
-        - Original OEM parts from the same manufacturer
-        - Completely unrelated automotive/industrial parts
-        - Parts for different equipment categories
-        - Vague compatibility claims without evidence
-        - Parts with conflicting specifications
-
-        Enhanced Analysis Instructions:
-        - Leverage the full context to cross-reference information across multiple sources
-        - Look for patterns in part numbering systems that indicate compatibility
-        - Identify aftermarket manufacturers known for quality cross-references
-        - Pay special attention to electrical specifications, dimensions, and mounting details
-        - Consider application-specific requirements (temperature, pressure, etc.)
-        - Validate compatibility claims by checking multiple sources when possible
-
-        Return ONLY a valid JSON array with detailed analysis. Each part entry should be thoroughly researched and validated using the comprehensive search results provided. Use GPT-4.1-Nano's enhanced analytical capabilities with 1M input token capacity to provide the most accurate and detailed compatibility assessment possible.
-        """
+        
+        prompt = self._compatibility_prompt(oem_part, oem_description, make, model, search_results)
         
         try:
             # Get OpenAI client safely
@@ -244,27 +524,29 @@ class GenericPartsFinder:
                 logger.warning("OpenAI client not available - skipping AI analysis")
                 return []
             
+            max_tokens = _completion_token_budget(options)
+            
             # Handle both new and old OpenAI clients - using GPT-4o-mini (more stable)
             if USING_NEW_OPENAI_CLIENT:
                 response = client.chat.completions.create(
                     model="gpt-4.1-nano-2025-04-14",
                     messages=[
-                        {"role": "system", "content": "You are an expert in automotive and industrial parts cross-referencing. Analyze search results to find compatible generic alternatives to OEM parts with comprehensive analysis."},
+                        {"role": "system", "content": COMPATIBILITY_SYSTEM_PROMPT},
                         {"role": "user", "content": prompt}
                     ],
-                    max_tokens=4000,  # Stable token limit
-                    temperature=0.2   # Lower temperature for more precise analysis
+                    max_tokens=max_tokens,
+                    temperature=0.2,  # Lower temperature for more precise analysis
+                    response_format={"type": "json_object"}
                 )
             else:
                 # Legacy OpenAI client - using GPT-4o-mini
-                import openai
                 response = openai.ChatCompletion.create(
                     model="gpt-4.1-nano-2025-04-14",
                     messages=[
-                        {"role": "system", "content": "You are an expert in automotive and industrial parts cross-referencing. Analyze search results to find compatible generic alternatives to OEM parts with comprehensive analysis."},
+                        {"role": "system", "content": COMPATIBILITY_SYSTEM_PROMPT},
                         {"role": "user", "content": prompt}
                     ],
-                    max_tokens=4000,  # Stable token limit
+                    max_tokens=max_tokens,
                     temperature=0.2   # Lower temperature for more precise analysis
                 )
             
@@ -274,79 +556,142 @@ class GenericPartsFinder:
             else:
                 ai_response = response.choices[0].message['content']
             
-            # Try to parse JSON from AI response
-            try:
-                # Extract JSON from response (handle cases where AI adds explanatory text)
-                import re
-                json_match = re.search(r'\[.*\]', ai_response, re.DOTALL)
-                if json_match:
-                    parsed_results = json.loads(json_match.group())
-                    
-                    # Add metadata to each result
-                    for result in parsed_results:
-                        result['ai_validated'] = True
-                        result['ai_analysis_date'] = None  # Could add timestamp
-                        
-                    return parsed_results
-                else:
-                    print("No JSON found in AI response")
-                    return []
-                    
-            except json.JSONDecodeError as e:
-                print(f"Error parsing AI response JSON: {e}")
+            parsed_results = _parse_alternatives(ai_response)
+            if not parsed_results:
+                logger.warning("No JSON found in AI response")
                 return []
+            
+            # Add metadata to each result
+            for result in parsed_results:
+                result['ai_validated'] = True
+                result['ai_analysis_date'] = None  # Could add timestamp
+            
+            return parsed_results
                 
         except Exception as e:
-            print(f"Error in AI analysis: {e}")
+            logger.exception("Error in AI analysis: %s", e)
             return []
     
+    def _stream_compatibility(self, oem_part: str, oem_description: str, make: str,
+                              model: str, search_results: List[Dict], options: Dict):
+        """Like _analyze_compatibility, but yield each part as the AI finishes writing it"""
+        if len(search_results) < MIN_SEARCH_RESULTS:
+            logger.info("Only %d search results for %s - skipping AI analysis", len(search_results), oem_part)
+            return
+        
+        client = get_openai_client()
+        if not client:
+            logger.warning("OpenAI client not available - skipping AI analysis")
+            return
+        
+        prompt = self._compatibility_prompt(oem_part, oem_description, make, model, search_results)
+        stream = client.chat.completions.create(
+            model="gpt-4.1-nano-2025-04-14",
+            messages=[
+                {"role": "system", "content": COMPATIBILITY_SYSTEM_PROMPT},
+                {"role": "user", "content": prompt}
+            ],
+            max_tokens=_completion_token_budget(options),
+            temperature=0.2,
+            response_format={"type": "json_object"},
+            stream=True
+        )
+        text = []
+        
+        def deltas():
+            for chunk in stream:
+                if chunk.choices:
+                    content = chunk.choices[0].delta.content or ''
+                    text.append(content)
+                    yield content
+        
+        streamed = deltas()
+        yielded = False
+        for result in _iter_json_array_items(streamed):
+            yielded = True
+            result['ai_validated'] = True
+            result['ai_analysis_date'] = None
+            yield result
+        if yielded:
+            return
+        
+        # Nothing came through under "alternatives" (e.g. the model used its
+        # own key), so read the finished text the way /find-generic does
+        for _ in streamed:
+            pass
+        for result in _parse_alternatives(''.join(text)):
+            result['ai_validated'] = True
+            result['ai_analysis_date'] = None
+            yield result
+    
     def _enhance_part_details(self, analyzed_results: List[Dict]) -> List[Dict]:
         """Enhance part details with additional searches for photos and specifications"""
-        enhanced_results = []
-        
+        # Look up every distinct image query at once; parts that share a
+        # manufacturer and part number reuse the same lookup
+        image_queries = []
+        image_futures = {}
         for part in analyzed_results:
-            enhanced_part = part.copy()
-            
+            part_number = part.get('generic_part_number')
+            query = self._image_query(part_number, part.get('manufacturer') or '') if part_number else None
+            image_queries.append(query)
+            if query is not None and query not in image_futures:
+                image_futures[query] = search_executor.submit(self._search_image_query, query)
+        
+        # analyzed_results is a fresh list from the AI analysis, so the parts
+        # are filled in place rather than copied
+        for part, query in zip(analyzed_results, image_queries):
             # Search for part images
-            if part.get('generic_part_number'):
-                image_url = self._search_part_image(part['generic_part_number'], part.get('manufacturer', ''))
-                enhanced_part['image_url'] = image_url
+            if query is not None:
+                part['image_url'] = image_futures[query].result()
             
             # Add additional metadata
-            enhanced_part['cost_savings_potential'] = self._estimate_savings(part)
-            enhanced_part['availability_score'] = self._estimate_availability(part)
-            
-            enhanced_results.append(enhanced_part)
+            part['cost_savings_potential'] = self._estimate_savings(part.get('confidence_score', 5))
+            part['availability_score'] = self._estimate_availability(
+                bool(part.get('manufacturer')), bool(part.get('source_website'))
+            )
         
-        return enhanced_results
+        return analyzed_results
+    
+    def _image_query(self, part_number: str, manufacturer: str) -> str:
+        """Normalized Google Images query for a part"""
+        query = f"{manufacturer} {part_number}" if manufacturer else part_number
+        return ' '.join(query.lower().split())
     
     def _search_part_image(self, part_number: str, manufacturer: str) -> Optional[str]:
         """Search for part images using Google Images API"""
+        return self._search_image_query(self._image_query(part_number, manufacturer))
+    
+    def _search_image_query(self, query: str) -> Optional[str]:
+        """Fetch the first Google Images result for a query, cached across requests"""
+        cached = self.image_cache.get(query)
+        if cached is not None:
+            return cached or None
+        
         try:
-            query = f"{manufacturer} {part_number}" if manufacturer else part_number
             params = {
                 'engine': 'google_images',
                 'q': query,
                 'api_key': self.serpapi_key,
-                'num': 1
+                'num': 1,
+                'json_restrictor': IMAGE_RESULTS_RESTRICTOR
             }
             
-            response = requests.get('https://serpapi.com/search', params=params)
+            response = HTTP_SESSION.get(SERPAPI_SEARCH_URL, params=params, timeout=SERPAPI_TIMEOUT)
             if response.status_code == 200:
                 data = response.json()
                 images = data.get('images_results', [])
-                if images:
-                    return images[0].get('original', '')
+                image_url = images[0].get('original', '') if images else ''
+                self.image_cache.set(query, image_url)
+                return image_url or None
                     
         except Exception as e:
-            print(f"Error searching for part image: {e}")
+            logger.warning("Error searching for part image: %s", e)
         
         return None
     
-    def _estimate_savings(self, part: Dict) -> str:
-        """Estimate potential cost savings compared to OEM"""
+    def _estimate_savings(self, confidence) -> str:
+        """Estimate potential cost savings compared to OEM from the AI confidence score"""
         # This is a simplified estimation - could be enhanced with actual price data
-        confidence = part.get('confidence_score', 5)
         if confidence >= 8:
             return "High (30-50% savings typical)"
         elif confidence >= 6:
@@ -354,15 +699,15 @@ class GenericPartsFinder:
         else:
             return "Variable (verify pricing)"
     
-    def _estimate_availability(self, part: Dict) -> int:
+    def _estimate_availability(self, has_manufacturer: bool, has_source: bool) -> int:
         """Estimate availability based on search results (1-10 scale)"""
         # Simplified scoring based on number of sources and manufacturer
         score = 5  # baseline
         
-        if part.get('manufacturer'):
+        if has_manufacturer:
             score += 2  # Known manufacturer
         
-        if part.get('source_website'):
+        if has_source:
             score += 1  # Has source
             
         # Cap at 10
@@ -371,6 +716,66 @@ class GenericPartsFinder:
 # Initialize the finder
 generic_finder = GenericPartsFinder()
 
+# Whole /find-generic responses; retries of the same lookup skip every SerpAPI
+# and OpenAI call. Failures are remembered briefly so a broken lookup that
+# callers keep retrying doesn't re-run the full pipeline each time.
+find_generic_cache = TTLCache(maxsize=2048, ttl=24 * 3600)
+find_generic_failures = TTLCache(maxsize=1024, ttl=300)
+
+def _find_generic_cache_key(make, model, oem_part_number, oem_part_description, search_options):
+    """Normalized cache key for a /find-generic request"""
+    return (
+        str(make).strip().lower(),
+        str(model).strip().lower(),
+        str(oem_part_number).strip().lower(),
+        str(oem_part_description).strip().lower(),
+        json.dumps(search_options or {}, sort_keys=True, default=str)
+    )
+
+def cached_find_generic_alternatives(make, model, oem_part_number, oem_part_description, search_options):
+    """
+    find_generic_alternatives() behind the response caches.
+    Returns (result, cache_hit).
+    """
+    cache_key = _find_generic_cache_key(make, model, oem_part_number, oem_part_description, search_options)
+    cached = find_generic_cache.get(cache_key)
+    if cached is None:
+        cached = find_generic_failures.get(cache_key)
+    if cached is not None:
+        return cached, True
+    
+    result = generic_finder.find_generic_alternatives(
+        make, model, oem_part_number, oem_part_description, search_options
+    )
+    
+    # Search and AI failures come back as a "successful" empty result, so only
+    # lookups that actually found alternatives are kept for the full day;
+    # everything else is retried after a few minutes
+    if result['success'] and result.get('generic_alternatives'):
+        find_generic_cache.set(cache_key, result)
+    else:
+        find_generic_failures.set(cache_key, result)
+    return result, False
+
+# Background /find-generic lookups, polled through /find-generic/<task_id>.
+# Jobs get their own pool: the pipeline itself fans out on search_executor, and
+# running jobs there could leave every worker waiting on queued searches.
+find_generic_jobs = TTLCache(maxsize=1024, ttl=3600)
+_job_executor = concurrent.futures.ThreadPoolExecutor(max_workers=4)
+
+def _run_find_generic_job(job, make, model, oem_part_number, oem_part_description, search_options):
+    """Run a find-generic lookup for a background job and record the outcome"""
+    job['status'] = 'running'
+    try:
+        job['result'], _ = cached_find_generic_alternatives(
+            make, model, oem_part_number, oem_part_description, search_options
+        )
+        job['status'] = 'completed' if job['result']['success'] else 'failed'
+    except Exception as e:
+        logger.error("Find-generic job %s failed: %s", job['task_id'], e)
+        job['result'] = {'success': False, 'error': str(e)}
+        job['status'] = 'failed'
+
 @generic_parts_bp.route('/find-generic', methods=['POST'])
 def find_generic_parts():
     """
@@ -388,6 +793,14 @@ def find_generic_parts():
             "max_results": 10
         }
     }
+    
+    Responses are cached for 24 hours (failures for 5 minutes) per
+    make/model/part/description/options; the X-Cache header reports HIT or
+    MISS. max_results sizes the AI completion budget: 2048 + 200 tokens per
+    result, capped at 8192.
+    
+    With "background": true the lookup runs off the request thread and a
+    task_id is returned immediately (202); poll /find-generic/<task_id>.
     """
     try:
         data = request.get_json()
@@ -407,15 +820,29 @@ def find_generic_parts():
         oem_part_description = data['oem_part_description']
         search_options = data.get('search_options', {})
         
+        if data.get('background'):
+            task_id = uuid.uuid4().hex
+            job = {'task_id': task_id, 'status': 'queued', 'result': None}
+            find_generic_jobs.set(task_id, job)
+            _job_executor.submit(
+                _run_find_generic_job, job,
+                make, model, oem_part_number, oem_part_description, search_options
+            )
+            return jsonify({
+                'task_id': task_id,
+                'status': 'queued',
+                'status_url': f'/api/parts/find-generic/{task_id}'
+            }), 202
+        
         # Find generic alternatives
-        result = generic_finder.find_generic_alternatives(
+        result, cache_hit = cached_find_generic_alternatives(
             make, model, oem_part_number, oem_part_description, search_options
         )
         
-        if result['success']:
-            return jsonify(result), 200
-        else:
-            return jsonify(result), 500
+        response = jsonify(result)
+        response.status_code = 200 if result['success'] else 500
+        response.headers['X-Cache'] = 'HIT' if cache_hit else 'MISS'
+        return response
             
     except Exception as e:
         return jsonify({
@@ -423,6 +850,44 @@ def find_generic_parts():
             'error': f'Internal server error: {str(e)}'
         }), 500
 
+@generic_parts_bp.route('/find-generic/<task_id>', methods=['GET'])
+def find_generic_task_status(task_id):
+    """Get the status, and once finished the result, of a background find-generic lookup"""
+    job = find_generic_jobs.get(task_id)
+    if job is None:
+        return jsonify({'success': False, 'error': 'Task not found'}), 404
+    
+    result = {'task_id': task_id, 'status': job['status']}
+    if job['result'] is not None:
+        result['result'] = job['result']
+    return jsonify(result)
+
+@generic_parts_bp.route('/find-generic-stream', methods=['POST'])
+def find_generic_parts_stream():
+    """
+    Stream generic/aftermarket alternatives as newline-delimited JSON
+    
+    Takes the same payload as /find-generic. Each alternative is written as
+    {"type": "alternative", "part": {...}} as soon as the AI finishes it,
+    followed by a final {"type": "done", ...} (or {"type": "error", ...}) line.
+    """
+    data = request.get_json(silent=True) or {}
+    
+    # Validate required fields
+    required_fields = ['make', 'model', 'oem_part_number', 'oem_part_description']
+    for field in required_fields:
+        if not data.get(field):
+            return jsonify({
+                'success': False,
+                'error': f'Missing required field: {field}'
+            }), 400
+    
+    stream = generic_finder.stream_generic_alternatives(
+        data['make'], data['model'], data['oem_part_number'],
+        data['oem_part_description'], data.get('search_options', {})
+    )
+    return Response(stream_with_context(stream), mimetype='application/x-ndjson')
+
 @generic_parts_bp.route('/validate-compatibility', methods=['POST'])
 def validate_compatibility():
     """
@@ -1,42 +1,150 @@
-from flask import Blueprint, request, jsonify, current_app
+from flask import Blueprint, Response, request, jsonify, current_app
 from models import db, Manual, ErrorCode, PartReference
 from services.manual_finder import search_manuals as search_manuals_service
 from services.manual_finder import download_manual as download_manual_service
-from services.manual_finder import verify_manual_contains_model, get_pdf_page_count
-from services.manual_parser import extract_text_from_pdf, extract_information, extract_components
+from services.manual_finder import is_valid_pdf, quick_verify
+from services.manual_finder import contains_model, fetch_and_analyze
+from services.manual_parser import extract_text_cached, extract_information, extract_components
 from services.pdf_preview_generator import PDFPreviewGenerator
 from services.pdf_two_page_preview import PDFTwoPagePreview
+from services import manual_cache
+from utils.cache import SingleFlight, TTLCache
+from utils.http import HTTP_SESSION
+import json
 import os
+import requests
 import logging
 import re
+import secrets
 import time
 import concurrent.futures
+from functools import lru_cache
+from itertools import chain
 from threading import Thread
+from sqlalchemy import insert
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import Session
+from urllib.parse import urlparse
 
-# Set up logging
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 manuals_bp = Blueprint('manuals', __name__)
 
-# Store manual URLs temporarily for proxy access
-manual_url_cache = {}
+# Store manual URLs temporarily for proxy access; bounded, and entries expire
+# after 24 hours
+manual_url_cache = TTLCache(maxsize=10000, ttl=86400)
+PROXY_CHUNK_SIZE = 64 * 1024
 
-def cleanup_expired_cache():
-    """Clean up expired cache entries"""
-    import time
-    current_time = time.time()
-    expired_keys = []
-    
-    for proxy_id, cache_entry in manual_url_cache.items():
-        if isinstance(cache_entry, dict) and current_time - cache_entry.get('timestamp', 0) > 86400:  # 24 hours
-            expired_keys.append(proxy_id)
-    
-    for key in expired_keys:
-        del manual_url_cache[key]
+# Concurrent process requests for the same manual share one run
+_inflight_manuals = SingleFlight()
+
+# Shared worker pools, so requests reuse threads instead of spawning a pool each
+# time. Search previews are waited on with a timeout; leftovers finish in the
+# background and still fill the manual metadata cache for the next search.
+# Hosts that recently could not be reached -> consecutive connection failures.
+# Once a host reaches HOST_FAILURE_LIMIT, search results there skip verification.
+# Per-URL problems (404s, oversized or unreadable PDFs) don't count.
+failed_hosts = TTLCache(maxsize=512, ttl=3600)
+HOST_FAILURE_LIMIT = 2
+
+# Results per search that get a preview and model check. The work is almost
+# all network waits, so the pool holds two searches' worth of threads
+PREVIEW_CANDIDATES = int(os.environ.get('MANUAL_PREVIEW_CANDIDATES', 8))
+PREVIEW_WAIT_SECONDS = 3.0
+PREVIEW_POOL = concurrent.futures.ThreadPoolExecutor(max_workers=2 * PREVIEW_CANDIDATES, thread_name_prefix='preview')
+MULTI_POOL = concurrent.futures.ThreadPoolExecutor(max_workers=8, thread_name_prefix='multi')
+
+# proxy_id -> {'status', 'preview_image', 'model_verified', 'pages'} for
+# previews generated after a background /search has already answered
+preview_jobs = TTLCache(maxsize=10000, ttl=3600)
+
+def register_proxy_url(result):
+    """Give a search result a short-lived proxy URL and return its proxy id."""
+    proxy_id = secrets.token_urlsafe(6)
+    manual_url_cache.set(proxy_id, {
+        'url': result['url'],
+        'title': result.get('title', 'Unknown')
+    })
+    result['proxy_url'] = f"/api/manuals/proxy/{proxy_id}"
+    return proxy_id
+
+def _run_preview_job(job, generate):
+    """Run preview generation for a background search, recording progress in its preview_jobs entry."""
+    job['status'] = 'running'
+    generate(job)
+    job['status'] = 'completed'
+
+def get_manual_text(manual):
+    """Extract a downloaded manual's text, reusing the cached copy from earlier requests"""
+    return extract_text_cached(manual.local_path)
+
+def verify_manual_for_model(pdf_url, model, render_preview=None):
+    """
+    Page count and model check for a manual URL, returned as its cached metadata.
     
-    if expired_keys:
-        logger.info(f"Cleaned up {len(expired_keys)} expired manual cache entries")
+    Tries, in order: the metadata cache, a ranged fetch of just the start of
+    the PDF, and finally a full temporary download hashed so the same file
+    served from another URL is recognised. When that download happens,
+    render_preview (if given) is called with its path and content, one of
+    which is None, and the result kept as the cached preview_url.
+    """
+    model_key = model.lower()
+    
+    # A manual seen before (same URL, unchanged file) needs no download
+    validator = manual_cache.url_validator(pdf_url)
+    meta = manual_cache.get_by_url(pdf_url, validator)
+    if meta is not None and model_key in meta['verified_models']:
+        return meta
+    
+    quick = quick_verify(pdf_url, model)
+    if quick is not None:
+        if meta is None:
+            meta = {
+                'cache_key': manual_cache.url_key(pdf_url, validator),
+                'pages': quick['pages'],
+                'verified_models': {},
+                'preview_url': None
+            }
+        else:
+            # Copied so concurrent requests never see a half-updated entry
+            meta = dict(meta, verified_models=dict(meta['verified_models']))
+        meta['verified_models'][model_key] = quick['model_verified']
+        manual_cache.put(meta['cache_key'], meta, pdf_url, validator)
+        return meta
+    
+    # Download the PDF once, hashing, counting pages and checking the model in the same pass
+    host = urlparse(pdf_url).netloc.replace('www.', '')
+    try:
+        fetched = fetch_and_analyze(pdf_url, model)
+    except (requests.ConnectionError, requests.Timeout):
+        # Remember hosts that keep failing so later searches don't wait on them again
+        failed_hosts.set(host, failed_hosts.get(host, 0) + 1)
+        raise
+    failed_hosts.pop(host, None)
+    try:
+        # The same file is often served from several URLs
+        sha = fetched['sha256']
+        cached_meta = manual_cache.get_by_hash(sha)
+        if cached_meta is not None:
+            meta = dict(cached_meta, verified_models=dict(cached_meta['verified_models']))
+        else:
+            meta = {
+                'cache_key': sha,
+                'pages': fetched['pages'],
+                'verified_models': {},
+                'preview_url': None
+            }
+        
+        meta['verified_models'][model_key] = bool(fetched['model_verified'])
+        # Render the preview from the PDF we already have rather than fetching the URL again
+        if render_preview is not None and not meta.get('preview_url'):
+            meta['preview_url'] = render_preview(fetched['path'], fetched['content'])
+        manual_cache.put(sha, meta, pdf_url, validator)
+        return meta
+    finally:
+        # Clean up temp file (small manuals were kept in memory)
+        if fetched['path'] and os.path.exists(fetched['path']):
+            os.remove(fetched['path'])
 
 @manuals_bp.route('/search', methods=['GET', 'POST'])
 def search_manuals():
@@ -47,19 +155,18 @@ def search_manuals():
         model = data.get('model')
         year = data.get('year')
         manual_type = data.get('manual_type', 'technical')
+        background = bool(data.get('background'))
     else:
         make = request.args.get('make')
         model = request.args.get('model')
         year = request.args.get('year')
         manual_type = request.args.get('type', 'technical')
+        background = request.args.get('background', '').lower() in ('1', 'true', 'yes')
     
     if not make or not model:
         return jsonify({'error': 'Make and model parameters are required'}), 400
     
     try:
-        # Clean up expired cache entries
-        cleanup_expired_cache()
-        
         if year:
             logger.info(f"Searching for {manual_type} manuals for {make} {model} {year}")
             results = search_manuals_service(make, model, manual_type, year)
@@ -77,45 +184,41 @@ def search_manuals():
             # Ensure it's there
             if 'source_domain' not in result:
                 try:
-                    from urllib.parse import urlparse
                     domain = urlparse(result.get('url', '')).netloc
                     result['source_domain'] = domain.replace('www.', '')
                 except:
                     result['source_domain'] = 'unknown'
         
+        def render_preview(pdf_path, pdf_bytes):
+            if pdf_bytes is not None:
+                return (two_page_preview.generate_from_bytes(pdf_bytes)
+                        or preview_generator.generate_preview_from_bytes(pdf_bytes))
+            return (two_page_preview.generate_from_file(pdf_path)
+                    or preview_generator.generate_preview_from_file(pdf_path))
+        
         # Generate preview images and verify manuals asynchronously
         def generate_preview_and_verify_async(result):
             try:
                 pdf_url = result.get('url', '')
                 logger.info(f"Attempting to generate preview for: {pdf_url}")
                 
-                # Download the PDF temporarily for verification and page count
-                temp_path = None
+                # Get page count and verify model is in the manual
+                meta = None
                 try:
-                    temp_path = download_manual_service(pdf_url)
-                    
-                    # Get page count
-                    page_count = get_pdf_page_count(temp_path)
-                    if page_count:
-                        result['pages'] = page_count
-                    else:
-                        result['pages'] = None
-                    
-                    # Verify model is in the manual
-                    if verify_manual_contains_model(temp_path, model):
-                        result['model_verified'] = True
-                    else:
-                        result['model_verified'] = False
+                    meta = verify_manual_for_model(pdf_url, model, render_preview)
+                    result['pages'] = meta['pages'] or None
+                    result['model_verified'] = meta['verified_models'][model.lower()]
+                    if not result['model_verified']:
                         logger.info(f"Model '{model}' not found in manual: {result.get('title', 'Unknown')}")
-                    
-                    # Clean up temp file
-                    if temp_path and os.path.exists(temp_path):
-                        os.remove(temp_path)
                 except Exception as ve:
                     logger.error(f"Error verifying manual: {ve}")
                     result['model_verified'] = True  # Default to include if can't verify
                     result['pages'] = None
                 
+                if meta is not None and meta.get('preview_url'):
+                    result['preview_image'] = meta['preview_url']
+                    return
+                
                 # Try two-page preview first
                 preview_url = two_page_preview.generate_from_url(pdf_url)
                 if not preview_url:
@@ -126,6 +229,8 @@ def search_manuals():
                 if preview_url:
                     result['preview_image'] = preview_url
                     logger.info(f"Generated preview for: {result.get('title', 'Unknown')}")
+                    if meta is not None:
+                        manual_cache.put(meta['cache_key'], dict(meta, preview_url=preview_url))
                 else:
                     logger.error(f"Failed to generate any preview for: {pdf_url}")
             except Exception as e:
@@ -133,34 +238,68 @@ def search_manuals():
                 result['model_verified'] = True  # Default to include
                 result['pages'] = None
         
-        # Start preview generation and verification in background threads
-        with concurrent.futures.ThreadPoolExecutor(max_workers=2) as executor:
-            futures = []
-            for result in results[:4]:  # Reduced to 4 for two-page previews (slower)
+        # Start preview generation and verification on the shared pool
+        # Results naming the model in their title or URL go first, and hosts that
+        # recently failed to download are skipped, so the preview slots go to the
+        # likeliest manuals
+        candidates = [
+            r for r in results
+            if failed_hosts.get(r.get('source_domain'), 0) < HOST_FAILURE_LIMIT
+        ]
+        likely = [
+            r for r in candidates
+            if contains_model(f"{r.get('title', '')} {r.get('url', '')}".lower(), model)
+        ]
+        likely_ids = {id(r) for r in likely}
+        candidates = likely + [r for r in candidates if id(r) not in likely_ids]
+        
+        if background:
+            # Answer now; the preview pool fills in preview_jobs and clients poll
+            # preview_status_url for each result. Nothing is filtered out here
+            # because model verification has not run yet.
+            proxy_ids = {}
+            for result in results:
+                proxy_ids[id(result)] = register_proxy_url(result)
+                result['preview_image'] = None
+            for result in candidates[:PREVIEW_CANDIDATES]:
+                proxy_id = proxy_ids[id(result)]
+                job = {
+                    'status': 'queued', 'preview_image': None, 'model_verified': True, 'pages': None,
+                    'url': result['url'], 'title': result.get('title', 'Unknown')
+                }
+                preview_jobs.set(proxy_id, job)
+                result['preview_status_url'] = f"/api/manuals/preview/{proxy_id}"
+                PREVIEW_POOL.submit(_run_preview_job, job, generate_preview_and_verify_async)
+            verified_results = results
+        else:
+            # Workers fill in their own copy of each result; a slow one may still
+            # be running while this response is built, so only finished copies
+            # are merged back
+            futures = {}
+            for result in candidates[:PREVIEW_CANDIDATES]:
                 result['preview_image'] = None  # Initialize
                 result['model_verified'] = True  # Default
                 result['pages'] = None  # Initialize
-                future = executor.submit(generate_preview_and_verify_async, result)
-                futures.append(future)
+                work = dict(result)
+                future = PREVIEW_POOL.submit(generate_preview_and_verify_async, work)
+                futures[future] = (result, work)
             
-            # Wait briefly for some previews to complete (max 3 seconds for two-page)
-            concurrent.futures.wait(futures, timeout=3.0)
-        
-        # Filter out manuals that don't contain the model (after verification)
-        verified_results = [r for r in results if r.get('model_verified', True)]
-        
-        # Generate proxy URLs for PDFs to avoid ad blocker issues
-        import uuid
-        import time
-        for result in verified_results:
-            proxy_id = str(uuid.uuid4())[:8]
-            # Store URL with timestamp for expiration (24 hours)
-            manual_url_cache[proxy_id] = {
-                'url': result['url'],
-                'timestamp': time.time(),
-                'title': result.get('title', 'Unknown')
-            }
-            result['proxy_url'] = f"/api/manuals/proxy/{proxy_id}"
+            # Wait briefly for some previews to complete, then drop any that
+            # never started so they don't hold up the next search
+            done, not_done = concurrent.futures.wait(futures, timeout=PREVIEW_WAIT_SECONDS)
+            for future in not_done:
+                future.cancel()
+            for future in done:
+                result, work = futures[future]
+                for field in ('preview_image', 'model_verified', 'pages'):
+                    result[field] = work[field]
+            
+            # Filter out manuals that don't contain the model (after verification)
+            verified_results = [r for r in results if r.get('model_verified', True)]
+            
+            # Generate proxy URLs for PDFs to avoid ad blocker issues
+            for result in verified_results:
+                register_proxy_url(result)
             
         return jsonify({
             'make': make,
@@ -319,7 +458,7 @@ def download_manual(manual_id):
     manual = Manual.query.get_or_404(manual_id)
     
     # Check if already downloaded
-    if manual.local_path and os.path.exists(manual.local_path):
+    if is_valid_pdf(manual.local_path):
         return jsonify({
             'message': 'Manual already downloaded',
             'local_path': manual.local_path
@@ -339,89 +478,173 @@ def download_manual(manual_id):
         logger.error(f"Error downloading manual: {e}")
         return jsonify({'error': str(e)}), 500
 
+# Values per IN (...) list, to stay under SQLite's bound-parameter limit
+IN_CLAUSE_CHUNK = 900
+
+def _existing_pairs(column, manual_id_column, manual_ids, values):
+    """The (manual_id, value) pairs already stored for these manuals, in a few bulk SELECTs"""
+    manual_ids = list(set(manual_ids))
+    values = list(set(values))
+    chunk_size = max(IN_CLAUSE_CHUNK - len(manual_ids), 1)
+    existing = set()
+    for i in range(0, len(values), chunk_size):
+        rows = db.session.query(manual_id_column, column).filter(
+            manual_id_column.in_(manual_ids),
+            column.in_(values[i:i + chunk_size])
+        )
+        existing.update((manual_id, value) for manual_id, value in rows)
+    return existing
+
+def _new_reference_rows(model, column, extracted, field):
+    """
+    Insert mappings for the (manual_id, code) pairs in extracted that aren't
+    stored yet, de-duplicated within the batch as well
+    
+    Args:
+        extracted (list): (manual_id, [{'code': ..., 'description': ...}]) pairs
+    """
+    seen = _existing_pairs(
+        column, model.manual_id,
+        [manual_id for manual_id, _ in extracted],
+        [item['code'] for _, items in extracted for item in items]
+    )
+    rows = []
+    for manual_id, items in extracted:
+        for item in items:
+            key = (manual_id, item['code'])
+            if key not in seen:
+                seen.add(key)
+                rows.append({
+                    'manual_id': manual_id,
+                    field: item['code'],
+                    'description': item.get('description', '')
+                })
+    return rows
+
+def store_extracted_references_bulk(extractions):
+    """
+    Add the error codes and part numbers that the manuals don't have yet,
+    as one Core INSERT per table (the caller commits)
+    
+    Args:
+        extractions (list): (manual_id, extracted_info) pairs
+        
+    Returns:
+        dict: manual_id -> (new error codes, new part references)
+    """
+    error_rows = _new_reference_rows(
+        ErrorCode, ErrorCode.code,
+        [(manual_id, info['error_codes']) for manual_id, info in extractions], 'code'
+    )
+    part_rows = _new_reference_rows(
+        PartReference, PartReference.part_number,
+        [(manual_id, info['part_numbers']) for manual_id, info in extractions], 'part_number'
+    )
+    
+    # Core INSERTs skip the ORM's per-row bookkeeping entirely
+    if error_rows:
+        db.session.execute(insert(ErrorCode.__table__), error_rows)
+    if part_rows:
+        db.session.execute(insert(PartReference.__table__), part_rows)
+    
+    counts = {manual_id: [0, 0] for manual_id, _ in extractions}
+    for row in error_rows:
+        counts[row['manual_id']][0] += 1
+    for row in part_rows:
+        counts[row['manual_id']][1] += 1
+    return {manual_id: tuple(count) for manual_id, count in counts.items()}
+
+def store_extracted_references(manual_id, extracted_info):
+    """
+    Add the error codes and part numbers from extracted_info that the manual
+    doesn't have yet (the caller commits)
+    
+    Returns:
+        tuple: (new error codes, new part references)
+    """
+    return store_extracted_references_bulk([(manual_id, extracted_info)])[manual_id]
+
+def process_manual_record(manual):
+    """
+    Download (if needed), extract and store the information for one manual
+    
+    Args:
+        manual (Manual): Manual to process
+        
+    Returns:
+        dict: Analysis results including the extracted error codes and part numbers
+    """
+    manual_id = manual.id
+    
+    # Download the manual if not already downloaded
+    if not is_valid_pdf(manual.local_path):
+        local_path = download_manual_service(manual.url)
+        manual.local_path = local_path
+        db.session.commit()
+    
+    # Extract text from the PDF
+    logger.info(f"Extracting text from manual ID {manual_id} PDF")
+    text = get_manual_text(manual)
+    
+    # Extract information from the text (pass manual_id for better logging)
+    logger.info(f"Performing AI analysis on manual ID {manual_id}")
+    start_time = time.time()
+    extracted_info = extract_information(text, manual_id)
+    duration = time.time() - start_time
+    logger.info(f"Manual ID {manual_id} processing completed in {duration:.2f} seconds")
+    
+    # Store error codes and part references
+    store_extracted_references(manual_id, extracted_info)
+    
+    # Update manual with comprehensive information
+    manual.processed = True
+    # Store the manual subject if available
+    if 'manual_subject' in extracted_info and extracted_info['manual_subject'] != "Unknown":
+        if not manual.title or manual.title == "Unknown Title":
+            manual.title = extracted_info['manual_subject']
+            
+    # Commit all changes
+    db.session.commit()
+    
+    # Return comprehensive analysis results including actual error codes and part numbers
+    return {
+        'message': 'Manual processed successfully',
+        'manual_id': manual.id,
+        'manual_subject': extracted_info.get('manual_subject', 'Unknown'),
+        'error_codes_count': len(extracted_info['error_codes']),
+        'part_numbers_count': len(extracted_info['part_numbers']),
+        'error_codes': extracted_info['error_codes'],  # Include the actual error codes
+        'part_numbers': extracted_info['part_numbers'],  # Include the actual part numbers
+        'common_problems': extracted_info.get('common_problems', []),
+        'maintenance_procedures': extracted_info.get('maintenance_procedures', []),
+        'safety_warnings': extracted_info.get('safety_warnings', [])
+    }
+    
 @manuals_bp.route('/<int:manual_id>/process', methods=['POST'])
 def process_manual(manual_id):
     """Process a manual to extract information"""
     manual = Manual.query.get_or_404(manual_id)
     
     try:
-        # Download the manual if not already downloaded
-        if not manual.local_path or not os.path.exists(manual.local_path):
-            local_path = download_manual_service(manual.url)
-            manual.local_path = local_path
-            db.session.commit()
-        
-        # Extract text from the PDF
-        logger.info(f"Extracting text from manual ID {manual_id} PDF")
-        text = extract_text_from_pdf(manual.local_path)
-        
-        # Extract information from the text (pass manual_id for better logging)
-        logger.info(f"Performing AI analysis on manual ID {manual_id}")
-        start_time = time.time()
-        extracted_info = extract_information(text, manual_id)
-        duration = time.time() - start_time
-        logger.info(f"Manual ID {manual_id} processing completed in {duration:.2f} seconds")
-        
-        # Store error codes
-        for error_code in extracted_info['error_codes']:
-            # Check if this error code already exists for this manual
-            existing = ErrorCode.query.filter_by(
-                manual_id=manual.id, 
-                code=error_code['code']
-            ).first()
-            
-            if not existing:
-                code = ErrorCode(
-                    manual_id=manual.id,
-                    code=error_code['code'],
-                    description=error_code.get('description', '')
-                )
-                db.session.add(code)
-        
-        # Store part references
-        for part in extracted_info['part_numbers']:
-            # Check if this part already exists for this manual
-            existing = PartReference.query.filter_by(
-                manual_id=manual.id, 
-                part_number=part['code']
-            ).first()
-            
-            if not existing:
-                part_ref = PartReference(
-                    manual_id=manual.id,
-                    part_number=part['code'],
-                    description=part.get('description', '')
-                )
-                db.session.add(part_ref)
-        
-        # Update manual with comprehensive information
-        manual.processed = True
-        # Store the manual subject if available
-        if 'manual_subject' in extracted_info and extracted_info['manual_subject'] != "Unknown":
-            if not manual.title or manual.title == "Unknown Title":
-                manual.title = extracted_info['manual_subject']
-                
-        # Commit all changes
-        db.session.commit()
-        
-        # Return comprehensive analysis results including actual error codes and part numbers
-        return jsonify({
-            'message': 'Manual processed successfully',
-            'manual_id': manual.id,
-            'manual_subject': extracted_info.get('manual_subject', 'Unknown'),
-            'error_codes_count': len(extracted_info['error_codes']),
-            'part_numbers_count': len(extracted_info['part_numbers']),
-            'error_codes': extracted_info['error_codes'],  # Include the actual error codes
-            'part_numbers': extracted_info['part_numbers'],  # Include the actual part numbers
-            'common_problems': extracted_info.get('common_problems', []),
-            'maintenance_procedures': extracted_info.get('maintenance_procedures', []),
-            'safety_warnings': extracted_info.get('safety_warnings', [])
-        })
+        return jsonify(_inflight_manuals.do(manual_id, process_manual_record, manual))
         
     except Exception as e:
         logger.error(f"Error processing manual: {e}")
         return jsonify({'error': str(e)}), 500
 
+def iter_json_object(fields):
+    """
+    Encode a dict as a JSON object one top-level field at a time.
+    
+    Used for large responses: each value goes through the C encoder
+    compactly and unsorted, and the response is sent in chunks instead of
+    being built as one string the way jsonify does.
+    """
+    yield '{'
+    for i, (key, value) in enumerate(fields.items()):
+        yield f"{',' if i else ''}{json.dumps(key)}:{json.dumps(value, separators=(',', ':'))}"
+    yield '}'
+
 @manuals_bp.route('/multi-process', methods=['POST'])
 def process_multiple_manuals():
     """
@@ -468,129 +691,115 @@ def process_multiple_manuals():
             })
             manual_objects.append(manual)
         
-        # Download all manuals in parallel
-        logger.info(f"Downloading {len(manual_objects)} manuals in parallel")
+        # Download all manuals in parallel and start processing each one as
+        # soon as its file is ready, so one manual's AI extraction overlaps
+        # the others' downloads
+        logger.info(f"Downloading and processing {len(manual_objects)} manuals in parallel")
         download_start = time.time()
+        manual_results = []
+        extraction_results = []
         
-        # Process manual download using ThreadPoolExecutor
-        with concurrent.futures.ThreadPoolExecutor(max_workers=len(manual_objects)) as executor:
-            download_futures = []
-            
-            # Get Flask app instance for thread context
-            from flask import current_app
-            app = current_app._get_current_object()  # Get the actual app object, not proxy
-            
-            # Start all downloads concurrently
-            for manual in manual_objects:
-                if not manual.local_path or not os.path.exists(manual.local_path):
-                    download_futures.append(
-                        executor.submit(download_and_update_manual, manual, manual.url, app)
-                    )
-                else:
-                    logger.info(f"Manual ID {manual.id} already downloaded to {manual.local_path}")
-            
-            # Wait for all downloads to complete
-            concurrent.futures.wait(download_futures)
+        # Process manual downloads and extraction on the shared pool
+        download_futures = []
+        processing_futures = []
+        
+        # Get Flask app instance for thread context
+        from flask import current_app
+        app = current_app._get_current_object()  # Get the actual app object, not proxy
+        
+        # The same PDF is often linked under different URLs, so group the
+        # manuals by content hash and extract each distinct file once
+        groups = {}
+        
+        def start_processing(manual):
+            if not is_valid_pdf(manual.local_path):
+                return
+            sha = manual_cache.file_sha256(manual.local_path)
+            if sha in groups:
+                groups[sha].append(manual)
+                logger.info(f"Manual IDs {[m.id for m in groups[sha]]} are the same file; processing it once")
+                return
+            groups[sha] = [manual]
+            processing_futures.append(
+                (groups[sha], MULTI_POOL.submit(process_manual_content, manual.id, manual.local_path))
+            )
+        
+        # Start all downloads concurrently, and processing for manuals already on disk
+        for manual in manual_objects:
+            if not is_valid_pdf(manual.local_path):
+                download_futures.append(
+                    MULTI_POOL.submit(download_and_update_manual, manual, manual.url, app)
+                )
+            else:
+                logger.info(f"Manual ID {manual.id} already downloaded to {manual.local_path}")
+                start_processing(manual)
+        
+        # Process each download as it completes. The workers wrote local_path in
+        # their own sessions, so copy it onto this request's objects as well
+        manuals_by_id = {manual.id: manual for manual in manual_objects}
+        for future in concurrent.futures.as_completed(download_futures):
+            result = future.result()
+            if result['success']:
+                manual = manuals_by_id[result['manual_id']]
+                manual.local_path = result['local_path']
+                start_processing(manual)
         
         download_duration = time.time() - download_start
         logger.info(f"All downloads completed in {download_duration:.2f} seconds")
         
-        # Process each manual in parallel and collect results
-        logger.info(f"Processing {len(manual_objects)} manuals in parallel")
+        # Collect the results; processing time is what remains after the last download
         process_start = time.time()
-        manual_results = []
-        extraction_results = []
-        
-        # Process manual extraction using ThreadPoolExecutor
-        with concurrent.futures.ThreadPoolExecutor(max_workers=len(manual_objects)) as executor:
-            processing_futures = []
-            
-            # Get Flask app instance for thread context (reusing from earlier)
-            if not 'app' in locals():
-                from flask import current_app
-                app = current_app._get_current_object()  # Get the actual app object, not proxy
-            
-            # Start all processing tasks concurrently
-            for manual in manual_objects:
-                if manual.local_path and os.path.exists(manual.local_path):
-                    processing_futures.append(
-                        executor.submit(process_manual_content, manual, app)
+        for group, future in processing_futures:
+            try:
+                result = future.result()
+                if not result:
+                    continue
+                # Fan the shared extraction back out to every manual with this file.
+                # These Manual objects belong to the request's session, so the
+                # updates made to them below get committed
+                for manual in group:
+                    manual_result = dict(
+                        result,
+                        manual=manual,
+                        manual_id=manual.id,
+                        result_data=dict(result['result_data'], manual_id=manual.id)
                     )
-                    
-            # Wait for all processing to complete and collect results
-            for future in concurrent.futures.as_completed(processing_futures):
-                try:
-                    result = future.result()
-                    if result:
-                        manual_results.append(result['result_data'])
-                        extraction_results.append(result)
-                except Exception as e:
-                    logger.error(f"Error processing manual content: {e}")
+                    manual_results.append(manual_result['result_data'])
+                    extraction_results.append(manual_result)
+            except Exception as e:
+                logger.error(f"Error processing manual content: {e}")
         
         process_duration = time.time() - process_start
         logger.info(f"All processing completed in {process_duration:.2f} seconds")
         
         # Update database with extraction results
         logger.info("Updating database with extraction results")
+        stored_extractions = []
         for extraction in extraction_results:
             if not extraction or not extraction.get('success'):
                 continue
                 
             manual = extraction['manual']
             extracted_info = extraction['extracted_info']
-            manual_id = manual.id
             
-            # Use a fresh session for each manual update
-            try:
-                # Mark as processed and update database records
-                manual.processed = True
-                
-                # Store the manual subject if available
-                if 'manual_subject' in extracted_info and extracted_info['manual_subject'] != "Unknown":
-                    if not manual.title or manual.title == "Unknown Title":
-                        manual.title = extracted_info['manual_subject']
-                
-                # Safely store error codes
-                error_count = 0
-                for error_code in extracted_info['error_codes']:
-                    # Check if this error code already exists for this manual
-                    existing = ErrorCode.query.filter_by(
-                        manual_id=manual_id, 
-                        code=error_code['code']
-                    ).first()
-                    
-                    if not existing:
-                        code = ErrorCode(
-                            manual_id=manual_id,
-                            code=error_code['code'],
-                            description=error_code.get('description', '')
-                        )
-                        db.session.add(code)
-                        error_count += 1
-                
-                # Safely store part references
-                part_count = 0
-                for part in extracted_info['part_numbers']:
-                    # Check if this part already exists for this manual
-                    existing = PartReference.query.filter_by(
-                        manual_id=manual_id, 
-                        part_number=part['code']
-                    ).first()
-                    
-                    if not existing:
-                        part_ref = PartReference(
-                            manual_id=manual_id,
-                            part_number=part['code'],
-                            description=part.get('description', '')
-                        )
-                        db.session.add(part_ref)
-                        part_count += 1
-                        
-                logger.info(f"Added {error_count} new error codes and {part_count} new part references for manual ID {manual_id}")  
-                
-            except Exception as e:
-                logger.error(f"Error updating database for manual ID {manual_id}: {e}")
-                # Continue with other manuals even if one fails
+            # Mark as processed
+            manual.processed = True
+            
+            # Store the manual subject if available
+            if 'manual_subject' in extracted_info and extracted_info['manual_subject'] != "Unknown":
+                if not manual.title or manual.title == "Unknown Title":
+                    manual.title = extracted_info['manual_subject']
+            
+            stored_extractions.append((manual.id, extracted_info))
+        
+        # Store every manual's new error codes and part references in one pass
+        try:
+            added = store_extracted_references_bulk(stored_extractions)
+            for manual_id, (error_count, part_count) in added.items():
+                logger.info(f"Added {error_count} new error codes and {part_count} new part references for manual ID {manual_id}")
+        except Exception as e:
+            logger.error(f"Error storing extracted references: {e}")
+            db.session.rollback()
         
         # Commit all database changes
         db.session.commit()
@@ -623,17 +832,51 @@ def process_multiple_manuals():
         # Add processing stats to reconciled results
         reconciled_results['processing_stats'] = processing_stats
         
-        # Return combined and reconciled results
-        return jsonify({
+        # Return combined and reconciled results, written out a field at a time
+        return Response(iter_json_object({
             'message': f'Successfully processed {len(manual_results)} manuals',
             'manuals': manuals_info,
             'reconciled_results': reconciled_results
-        })
+        }), mimetype='application/json')
         
     except Exception as e:
         logger.error(f"Error processing multiple manuals: {e}")
         return jsonify({'error': str(e)}), 500
 
+# Attempts at a row write when SQLite reports the database as locked
+SQLITE_LOCK_RETRIES = 3
+
+def update_manual_row(app, manual_id, **values):
+    """
+    Set columns on one manual from a worker thread.
+    
+    Uses a short-lived session of its own rather than the request's, and on
+    backends with row locks skips a manual another request is already
+    updating instead of waiting for it. SQLite has no row locks, so a write
+    that finds the database locked is retried briefly.
+    
+    Returns:
+        bool: True if the row was updated
+    """
+    with app.app_context():
+        sqlite = db.engine.dialect.name == 'sqlite'
+        for attempt in range(SQLITE_LOCK_RETRIES):
+            with Session(db.engine) as session:
+                try:
+                    db_manual = session.query(Manual).filter_by(id=manual_id).with_for_update(skip_locked=True).one_or_none()
+                    if db_manual is None:
+                        logger.warning(f"Manual ID {manual_id} not found or locked by another request; not updated")
+                        return False
+                    for column, value in values.items():
+                        setattr(db_manual, column, value)
+                    session.commit()
+                    return True
+                except OperationalError as e:
+                    session.rollback()
+                    if not sqlite or 'locked' not in str(e) or attempt == SQLITE_LOCK_RETRIES - 1:
+                        raise
+                    time.sleep(0.1 * (attempt + 1))
+
 def download_and_update_manual(manual, url, app):
     """
     Helper function to download a manual and update the database
@@ -654,17 +897,9 @@ def download_and_update_manual(manual, url, app):
         local_path = download_manual_service(url)
         duration = time.time() - start_time
         
-        # Use Flask app context for database operations
-        with app.app_context():
-            # Get a fresh instance of the manual from the database
-            from models import Manual, db
-            db_manual = Manual.query.get(manual.id)
-            if db_manual:
-                db_manual.local_path = local_path
-                db.session.commit()
-                logger.info(f"Database updated with local path for manual ID {manual.id}")
-            else:
-                logger.warning(f"Manual ID {manual.id} not found in database when updating local path")
+        # Record the path in this worker's own session
+        if update_manual_row(app, manual.id, local_path=local_path):
+            logger.info(f"Database updated with local path for manual ID {manual.id}")
         
         logger.info(f"Manual ID {manual.id} downloaded to {local_path} in {duration:.2f} seconds")
         return {
@@ -681,20 +916,20 @@ def download_and_update_manual(manual, url, app):
             'error': str(e)
         }
 
-def process_manual_content(manual, app):
+def process_manual_content(manual_id, manual_path):
     """
     Helper function to process a manual's content
     
+    Needs no database access, so worker threads run it without an app context.
+    
     Args:
-        manual (Manual): Manual object to process
-        app: Flask application instance for context management
+        manual_id (int): ID of the manual, for logging and the results
+        manual_path (str): Local path of the downloaded PDF
         
     Returns:
-        dict: Extraction results and manual information
+        dict: Extraction results for the manual
     """
     try:
-        manual_id = manual.id
-        manual_path = manual.local_path  # Store the path since we'll need it outside app context
         logger.info(f"Processing manual ID {manual_id} content")
         start_time = time.time()
         
@@ -703,9 +938,9 @@ def process_manual_content(manual, app):
             logger.error(f"Manual file not found at {manual_path} for manual ID {manual_id}")
             return None
             
-        # Extract text from the PDF - doesn't need app context
+        # Extract text from the PDF
         logger.info(f"Extracting text from manual ID {manual_id}")
-        text = extract_text_from_pdf(manual_path)
+        text = extract_text_cached(manual_path)
         
         # Extract information from the text (pass manual_id for better logging)
         logger.info(f"Extracting information from manual ID {manual_id} text")
@@ -722,26 +957,73 @@ def process_manual_content(manual, app):
             'safety_warnings': extracted_info.get('safety_warnings', [])
         }
         
-        # Get fresh manual object within app context
-        with app.app_context():
-            from models import Manual, db
-            db_manual = Manual.query.get(manual_id)
-        
         duration = time.time() - start_time
         logger.info(f"Manual ID {manual_id} processed in {duration:.2f} seconds")
         logger.info(f"Found {len(extracted_info['error_codes'])} error codes and {len(extracted_info['part_numbers'])} part numbers in manual ID {manual_id}")
         
         return {
             'success': True,
-            'manual': db_manual or manual,  # Use the fresh object if available
+            'manual_id': manual_id,
             'extracted_info': extracted_info,
             'result_data': result_data,
             'duration': duration
         }
     except Exception as e:
-        logger.error(f"Error processing manual ID {manual.id}: {e}")
+        logger.error(f"Error processing manual ID {manual_id}: {e}")
         return None
 
+# Everything that isn't part of an error code or part number proper
+NON_CODE_CHARS_RE = re.compile(r'[^A-Z0-9]')
+NON_CODE_BYTES = bytes(b for b in range(256) if not (65 <= b <= 90 or 48 <= b <= 57))
+
+# The same codes recur across manuals and across requests, so each is normalized once
+@lru_cache(maxsize=8192)
+def normalize_code(code):
+    """Normalize a code for comparison: uppercase, with whitespace and special characters removed"""
+    code = code.upper()
+    if code.isascii():
+        # Most codes are plain ASCII: already clean, or cleaned by one C-level bytes.translate
+        if code.isalnum():
+            return code
+        return code.encode('ascii').translate(None, NON_CODE_BYTES).decode('ascii')
+    return NON_CODE_CHARS_RE.sub('', code)
+
+def _accumulate_codes(items, codes_dict, manual_id):
+    """
+    Merge one manual's error codes or part numbers into the reconciliation state
+    
+    Args:
+        items (list): {'code': ..., 'description': ...} dicts from one manual
+        codes_dict (dict): normalized code -> merged entry
+        manual_id: ID of the manual the items came from
+    """
+    for item in items:
+        # Each field is read once; a null description counts as an empty one
+        code = item['code']
+        description = item.get('description') or ''
+        norm_code = normalize_code(code)
+        
+        # Update the dictionary with this code, looking the entry up once
+        entry = codes_dict.get(norm_code)
+        if entry is None:
+            codes_dict[norm_code] = {
+                'code': code,
+                'description': description,
+                'normalized_code': norm_code,
+                'sources': {manual_id}
+            }
+        else:
+            # Track the source manual
+            entry['sources'].add(manual_id)
+            
+            # Keep the existing code format if it's more detailed
+            if len(code) > len(entry['code']):
+                entry['code'] = code
+            
+            # Keep the longest description seen so far (the first one on ties)
+            if description and len(description) > len(entry['description']):
+                entry['description'] = description
+
 def reconcile_multiple_manual_results(manual_results):
     """
     Reconcile results from multiple manuals, removing duplicates and selecting the best data.
@@ -772,165 +1054,58 @@ def reconcile_multiple_manual_results(manual_results):
     # Use dictionaries to track unique codes (based on normalized keys)
     error_codes_dict = {}
     part_numbers_dict = {}
-    common_problems_dict = {}
-    maintenance_procedures_set = set()
-    safety_warnings_set = set()
-    
-    # Track which codes appear in multiple manuals (for confidence scoring)
-    error_code_appearances = {}
-    part_number_appearances = {}
-    
-    # Helper function to normalize codes for comparison
-    def normalize_code(code):
-        # Remove all whitespace and special characters, convert to uppercase
-        return re.sub(r'[^A-Z0-9]', '', code.upper())
     
-    # First pass: Collect all unique codes and track their appearances across manuals
+    # First pass: Collect all unique codes; each entry's sources record which
+    # manuals it appears in (for confidence scoring)
     for manual_result in manual_results:
         manual_id = manual_result['manual_id']
         
-        # Process error codes
-        for error in manual_result['error_codes']:
-            code = error['code']
-            norm_code = normalize_code(code)
-            
-            # Update appearances count
-            if norm_code not in error_code_appearances:
-                error_code_appearances[norm_code] = set()
-            error_code_appearances[norm_code].add(manual_id)
-            
-            # Update the dictionary with this code
-            if norm_code not in error_codes_dict:
-                error_codes_dict[norm_code] = {
-                    'code': code,
-                    'description': error.get('description', ''),
-                    'normalized_code': norm_code,
-                    'sources': [manual_id],
-                    'all_descriptions': [error.get('description', '')]
-                }
-            else:
-                # Track the source manual
-                if manual_id not in error_codes_dict[norm_code]['sources']:
-                    error_codes_dict[norm_code]['sources'].append(manual_id)
-                
-                # Keep the existing code format if it's more detailed
-                if len(code) > len(error_codes_dict[norm_code]['code']):
-                    error_codes_dict[norm_code]['code'] = code
-                
-                # Track all descriptions for later reconciliation
-                if error.get('description') and error.get('description') not in error_codes_dict[norm_code]['all_descriptions']:
-                    error_codes_dict[norm_code]['all_descriptions'].append(error.get('description', ''))
-        
-        # Process part numbers
-        for part in manual_result['part_numbers']:
-            code = part['code']
-            norm_code = normalize_code(code)
-            
-            # Update appearances count
-            if norm_code not in part_number_appearances:
-                part_number_appearances[norm_code] = set()
-            part_number_appearances[norm_code].add(manual_id)
-            
-            # Update the dictionary with this code
-            if norm_code not in part_numbers_dict:
-                part_numbers_dict[norm_code] = {
-                    'code': code,
-                    'description': part.get('description', ''),
-                    'normalized_code': norm_code,
-                    'sources': [manual_id],
-                    'all_descriptions': [part.get('description', '')]
-                }
-            else:
-                # Track the source manual
-                if manual_id not in part_numbers_dict[norm_code]['sources']:
-                    part_numbers_dict[norm_code]['sources'].append(manual_id)
-                
-                # Keep the existing code format if it's more detailed
-                if len(code) > len(part_numbers_dict[norm_code]['code']):
-                    part_numbers_dict[norm_code]['code'] = code
-                
-                # Track all descriptions for later reconciliation
-                if part.get('description') and part.get('description') not in part_numbers_dict[norm_code]['all_descriptions']:
-                    part_numbers_dict[norm_code]['all_descriptions'].append(part.get('description', ''))
-        
-        # Process common problems (using problem text as key)
-        for problem in manual_result.get('common_problems', []):
-            problem_key = problem.get('issue', '').strip().lower()
-            if problem_key and problem_key not in common_problems_dict:
-                common_problems_dict[problem_key] = problem
-        
-        # Process maintenance procedures
-        for procedure in manual_result.get('maintenance_procedures', []):
-            proc_text = procedure.strip()
-            if proc_text:
-                maintenance_procedures_set.add(proc_text)
-        
-        # Process safety warnings
-        for warning in manual_result.get('safety_warnings', []):
-            warning_text = warning.strip()
-            if warning_text:
-                safety_warnings_set.add(warning_text)
-    
-    # Second pass: Reconcile descriptions and choose the best one
-    # For error codes and part numbers, prefer:
-    # 1. Descriptions that appear in multiple manuals
-    # 2. Longer, more detailed descriptions
-    
-    reconciled_error_codes = []
-    for norm_code, error_data in error_codes_dict.items():
-        # Calculate a confidence score based on number of manuals with this code
-        confidence = (len(error_data['sources']) / manual_count) * 100
-        
-        # Choose the best description
-        if len(error_data['all_descriptions']) > 1:
-            # Sort descriptions by length (prefer longer descriptions)
-            sorted_descriptions = sorted(
-                [desc for desc in error_data['all_descriptions'] if desc], 
-                key=len, 
-                reverse=True
-            )
-            best_description = sorted_descriptions[0] if sorted_descriptions else ""
-        else:
-            best_description = error_data['description']
-        
-        # Create the reconciled error code
-        reconciled_error = {
+        # Process error codes and part numbers
+        _accumulate_codes(manual_result['error_codes'], error_codes_dict, manual_id)
+        _accumulate_codes(manual_result['part_numbers'], part_numbers_dict, manual_id)
+    
+    # Common problems are keyed by their issue text; the first manual to list one wins
+    common_problems_dict = {}
+    for problem in chain.from_iterable(m.get('common_problems', ()) for m in manual_results):
+        problem_key = problem.get('issue', '').strip().lower()
+        if problem_key:
+            common_problems_dict.setdefault(problem_key, problem)
+    
+    maintenance_procedures_set = {
+        text for m in manual_results for procedure in m.get('maintenance_procedures', ())
+        if (text := procedure.strip())
+    }
+    safety_warnings_set = {
+        text for m in manual_results for warning in m.get('safety_warnings', ())
+        if (text := warning.strip())
+    }
+    
+    # Second pass: Build the reconciled entries with confidence scores.
+    # The longest description was already chosen while collecting, and
+    # confidence is the share of manuals that list the code
+    reconciled_error_codes = [
+        {
             'code': error_data['code'],
             'Error Code Number': error_data['code'],
-            'Short Error Description': best_description,
-            'description': best_description,
-            'confidence': confidence,
+            'Short Error Description': error_data['description'],
+            'description': error_data['description'],
+            'confidence': (len(error_data['sources']) / manual_count) * 100,
             'manual_count': len(error_data['sources'])
         }
-        reconciled_error_codes.append(reconciled_error)
+        for error_data in error_codes_dict.values()
+    ]
     
-    reconciled_part_numbers = []
-    for norm_code, part_data in part_numbers_dict.items():
-        # Calculate a confidence score based on number of manuals with this part number
-        confidence = (len(part_data['sources']) / manual_count) * 100
-        
-        # Choose the best description
-        if len(part_data['all_descriptions']) > 1:
-            # Sort descriptions by length (prefer longer descriptions)
-            sorted_descriptions = sorted(
-                [desc for desc in part_data['all_descriptions'] if desc], 
-                key=len, 
-                reverse=True
-            )
-            best_description = sorted_descriptions[0] if sorted_descriptions else ""
-        else:
-            best_description = part_data['description']
-        
-        # Create the reconciled part number
-        reconciled_part = {
+    reconciled_part_numbers = [
+        {
             'code': part_data['code'],
             'OEM Part Number': part_data['code'],
-            'Short Part Description': best_description,
-            'description': best_description,
-            'confidence': confidence,
+            'Short Part Description': part_data['description'],
+            'description': part_data['description'],
+            'confidence': (len(part_data['sources']) / manual_count) * 100,
             'manual_count': len(part_data['sources'])
         }
-        reconciled_part_numbers.append(reconciled_part)
+        for part_data in part_numbers_dict.values()
+    ]
     
     # Sort the reconciled results by confidence (highest first)
     reconciled_error_codes.sort(key=lambda x: x['confidence'], reverse=True)
@@ -993,6 +1168,43 @@ def get_part_numbers(manual_id):
         } for ref in part_references]
     })
 
+@manuals_bp.route('/<int:manual_id>/extract', methods=['GET'])
+def get_manual_extraction(manual_id):
+    """Get the error codes and part numbers extracted from a manual in one response"""
+    manual = Manual.query.get_or_404(manual_id)
+    
+    error_codes = ErrorCode.query.filter_by(manual_id=manual_id).all()
+    part_numbers = PartReference.query.filter_by(manual_id=manual_id).all()
+    
+    return jsonify({
+        'manual_id': manual_id,
+        'manual_title': manual.title,
+        'make': manual.make,
+        'model': manual.model,
+        'error_codes': [
+            {
+                'code': ec.code,
+                'description': ec.description,
+                'created_at': ec.created_at.isoformat() if ec.created_at else None
+            }
+            for ec in error_codes
+        ],
+        'error_codes_count': len(error_codes),
+        'part_numbers': [
+            {
+                'part_number': pn.part_number,
+                'description': pn.description,
+                'created_at': pn.created_at.isoformat() if pn.created_at else None
+            }
+            for pn in part_numbers
+        ],
+        'part_numbers_count': len(part_numbers),
+        'error_codes_format': 'Error Code Number, Short Error Description',
+        'part_numbers_format': 'OEM Part Number, Short Part Description',
+        'extraction_source': 'GPT-4.1-Nano PDF Analysis',
+        'processed': manual.processed
+    })
+
 @manuals_bp.route('/<int:manual_id>/components', methods=['GET'])
 def get_manual_components(manual_id):
     """
@@ -1005,13 +1217,13 @@ def get_manual_components(manual_id):
     
     try:
         # Download the manual if not already downloaded
-        if not manual.local_path or not os.path.exists(manual.local_path):
+        if not is_valid_pdf(manual.local_path):
             local_path = download_manual_service(manual.url)
             manual.local_path = local_path
             db.session.commit()
         
         # Extract text from the PDF
-        text = extract_text_from_pdf(manual.local_path)
+        text = get_manual_text(manual)
         
         # Extract components from the text
         default_prompt = "Analyze this technical manual and identify key structural components with page ranges"
@@ -1044,13 +1256,13 @@ def process_manual_components(manual_id):
     
     try:
         # Download the manual if not already downloaded
-        if not manual.local_path or not os.path.exists(manual.local_path):
+        if not is_valid_pdf(manual.local_path):
             local_path = download_manual_service(manual.url)
             manual.local_path = local_path
             db.session.commit()
         
         # Extract text from the PDF
-        text = extract_text_from_pdf(manual.local_path)
+        text = get_manual_text(manual)
         
         # Log if using a custom prompt
         if custom_prompt:
@@ -1152,23 +1364,29 @@ def get_components_static(manual_id):
     
     return jsonify(result)
 
+@manuals_bp.route('/preview/<proxy_id>', methods=['GET'])
+def get_preview_status(proxy_id):
+    """Poll the preview and model check for a result from a background search"""
+    job = preview_jobs.get(proxy_id)
+    if job is None:
+        return jsonify({'error': 'Preview not found or expired'}), 404
+    return jsonify({
+        'status': job['status'],
+        'preview_image': job['preview_image'],
+        'model_verified': job['model_verified'],
+        'pages': job['pages']
+    })
+
 @manuals_bp.route('/proxy/<proxy_id>')
 def proxy_manual(proxy_id):
     """Proxy manual PDF to avoid ad blocker issues"""
     from flask import redirect, Response
-    import requests
     
-    # Get the original URL with expiration check
+    # Get the original URL; expired entries are dropped by the cache
     cache_entry = manual_url_cache.get(proxy_id)
     if not cache_entry:
         return jsonify({'error': 'Manual not found or expired. Please refresh the search.'}), 404
     
-    # Check if cache entry is expired (24 hours)
-    import time
-    if time.time() - cache_entry.get('timestamp', 0) > 86400:  # 24 hours
-        del manual_url_cache[proxy_id]
-        return jsonify({'error': 'Manual link expired. Please refresh the search.'}), 404
-    
     original_url = cache_entry['url']
     
     try:
@@ -1179,13 +1397,18 @@ def proxy_manual(proxy_id):
             headers = {
                 'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
             }
-            response = requests.get(original_url, headers=headers, stream=True, timeout=10)
+            # Pooled keep-alive session; the upstream connection goes back to the
+            # pool once the body has been relayed
+            response = HTTP_SESSION.get(original_url, headers=headers, stream=True, timeout=(5, 30))
             
-            if response.status_code == 200:
+            if response.status_code != 200:
+                response.close()
+            else:
                 # Return the PDF content with proper headers
                 def generate():
-                    for chunk in response.iter_content(chunk_size=8192):
-                        yield chunk
+                    with response:
+                        for chunk in response.iter_content(chunk_size=PROXY_CHUNK_SIZE):
+                            yield chunk
                 
                 return Response(
                     generate(),
@@ -3,8 +3,6 @@ from models import db, Part
 from services.part_resolver import resolve_part_name
 import logging
 
-# Set up logging
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 parts_bp = Blueprint('parts', __name__)
@@ -36,12 +34,18 @@ def resolve_part():
     if 'description' not in data:
         return jsonify({'error': 'Description is required'}), 400
     
+    # Read request fields once
+    description = data['description']
+    make = data.get('make')
+    model = data.get('model')
+    year = data.get('year')
+    
     # Ensure description is not empty
-    if not data['description'].strip():
+    if not description.strip():
         return jsonify({'error': 'Description cannot be empty'}), 400
     
     try:
-        logger.info(f"API: Resolving part: {data.get('description')} for {data.get('make')} {data.get('model')} {data.get('year')}")
+        logger.info(f"API: Resolving part: {description} for {make} {model} {year}")
         
         # Get search toggle parameters with defaults
         use_database = data.get('use_database', True)
@@ -94,10 +98,10 @@ def resolve_part():
         
         # Execute part resolution with selected methods
         result = resolve_part_name(
-            description=data['description'],
-            make=data.get('make'),
-            model=data.get('model'),
-            year=data.get('year'),
+            description=description,
+            make=make,
+            model=model,
+            year=year,
             use_database=use_database,
             use_manual_search=use_manual_search,
             use_web_search=use_web_search,
@@ -111,17 +115,17 @@ def resolve_part():
             return jsonify({
                 'success': False,
                 'error': "Internal error: No result returned from resolver",
-                'message': f"Failed to resolve part '{data.get('description')}'"
+                'message': f"Failed to resolve part '{description}'"
             }), 500
         
         # Build structured response with the enhanced data
         response = {
             "success": True,
             "query": result.get("query", {
-                "description": data.get('description'),
-                "make": data.get('make'),
-                "model": data.get('model'),
-                "year": data.get('year')
+                "description": description,
+                "make": make,
+                "model": model,
+                "year": year
             }),
             "results": {
                 "database": result.get("database_result"),
@@ -210,7 +214,7 @@ def resolve_part():
         return jsonify({
             'success': False,
             'error': str(e),
-            'message': f"Failed to resolve part '{data.get('description')}'"
+            'message': f"Failed to resolve part '{description}'"
         }), 500
 
 @parts_bp.route('', methods=['GET'])
@@ -399,23 +403,30 @@ def find_similar_parts():
     if 'description' not in data:
         return jsonify({'error': 'Description is required'}), 400
     
+    # Read request fields once
+    description = data['description']
+    make = data.get('make')
+    model = data.get('model')
+    year = data.get('year')
+    failed_part_number = data.get('failed_part_number')
+    
     # Ensure description is not empty
-    if not data['description'].strip():
+    if not description.strip():
         return jsonify({'error': 'Description cannot be empty'}), 400
     
     try:
-        logger.info(f"API: Finding similar parts for: {data.get('description')} for {data.get('make')} {data.get('model')}")
+        logger.info(f"API: Finding similar parts for: {description} for {make} {model}")
         
         # Import the find_similar_parts function from the service layer
         from services.part_resolver import find_similar_parts as find_similar_parts_service
         
         # Call the service to find similar parts
         similar_parts = find_similar_parts_service(
-            description=data['description'],
-            make=data.get('make'),
-            model=data.get('model'),
-            year=data.get('year'),
-            failed_part_number=data.get('failed_part_number'),  # Optional: the part number that failed validation
+            description=description,
+            make=make,
+            model=model,
+            year=year,
+            failed_part_number=failed_part_number,  # Optional: the part number that failed validation
             max_results=data.get('max_results', 10)  # Default to 10 results
         )
         
@@ -423,12 +434,12 @@ def find_similar_parts():
         if not similar_parts or len(similar_parts) == 0:
             return jsonify({
                 'success': False,
-                'message': f"No similar parts found for '{data.get('description')}'",
+                'message': f"No similar parts found for '{description}'",
                 'query': {
-                    'description': data.get('description'),
-                    'make': data.get('make'),
-                    'model': data.get('model'),
-                    'year': data.get('year')
+                    'description': description,
+                    'make': make,
+                    'model': model,
+                    'year': year
                 },
                 'similar_parts': []
             }), 404
@@ -437,11 +448,11 @@ def find_similar_parts():
         response = {
             'success': True,
             'query': {
-                'description': data.get('description'),
-                'make': data.get('make'),
-                'model': data.get('model'),
-                'year': data.get('year'),
-                'failed_part_number': data.get('failed_part_number')
+                'description': description,
+                'make': make,
+                'model': model,
+                'year': year,
+                'failed_part_number': failed_part_number
             },
             'similar_parts': similar_parts,
             'total_found': len(similar_parts),
@@ -454,7 +465,7 @@ def find_similar_parts():
         }
         
         # Add a summary message
-        response['summary'] = f"Found {len(similar_parts)} similar or alternative parts for '{data.get('description')}'"
+        response['summary'] = f"Found {len(similar_parts)} similar or alternative parts for '{description}'"
         
         return jsonify(response)
     
@@ -463,5 +474,5 @@ def find_similar_parts():
         return jsonify({
             'success': False,
             'error': str(e),
-            'message': f"Failed to find similar parts for '{data.get('description')}'"
+            'message': f"Failed to find similar parts for '{description}'"
         }), 500
\ No newline at end of file
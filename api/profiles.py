@@ -2,8 +2,6 @@ from flask import Blueprint, request, jsonify
 from models import db, BillingProfile
 import logging
 
-# Set up logging
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 profiles_bp = Blueprint('profiles', __name__)
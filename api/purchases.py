@@ -2,8 +2,6 @@ from flask import Blueprint, request, jsonify
 from models import db, Purchase, BillingProfile
 import logging
 
-# Set up logging
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 purchases_bp = Blueprint('purchases', __name__)
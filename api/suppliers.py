@@ -4,8 +4,6 @@ from services.supplier_finder import find_suppliers
 from services.supplier_finder_v2 import search_suppliers_v2
 import logging
 
-# Set up logging
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 suppliers_bp = Blueprint('suppliers', __name__)
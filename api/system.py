@@ -7,8 +7,6 @@ import glob
 import time
 from datetime import datetime
 
-# Set up logging
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 system_bp = Blueprint('system', __name__)
@@ -219,6 +217,29 @@ def clear_cache():
     except Exception as e:
         logger.error(f"Error clearing temporary files: {e}")
     
+    # 3. Clear in-memory lookup caches
+    from api.demo import demo_cache
+    from services.enrichment_service import enrichment_cache
+    from services.manual_parser import extraction_cache, extracted_text_cache, MANUAL_TEXT_CACHE_DIR
+    from api.generic_parts import generic_finder, find_generic_cache, find_generic_failures
+    from services import manual_cache
+    demo_cache.clear()
+    enrichment_cache.clear()
+    extraction_cache.clear()
+    extracted_text_cache.clear()
+    generic_finder.search_cache.clear()
+    generic_finder.image_cache.clear()
+    find_generic_cache.clear()
+    find_generic_failures.clear()
+    manual_cache.clear()
+    
+    # 4. Clear extracted manual text
+    try:
+        for file_path in glob.glob(os.path.join(MANUAL_TEXT_CACHE_DIR, "*.txt.gz")):
+            os.unlink(file_path)
+    except Exception as e:
+        logger.error(f"Error clearing manual text cache: {e}")
+    
     # Log completion
     logger.info("Cache clearing completed")
 
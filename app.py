@@ -11,18 +11,26 @@ from api.screenshots import screenshots_bp
 from api.generic_parts import generic_parts_bp
 from api.demo import demo_bp
 from api.admin import admin_bp
+import logging
 import os
 
 def create_app():
     """Create and configure the Flask application"""
     app = Flask(__name__, static_folder='static', static_url_path='/static')
     
+    # Configure logging once for the whole app; LOG_LEVEL=WARNING silences per-request logs
+    logging.basicConfig(level=os.environ.get('LOG_LEVEL', 'INFO').upper())
+    
     # Load configuration
     app.config.from_object('config.Config')
     
     # Disable caching for development
     app.config['SEND_FILE_MAX_AGE_DEFAULT'] = 0
     
+    # Serialize responses in insertion order; sorting keys of every nested
+    # dict is wasted work on the large manual and enrichment payloads
+    app.json.sort_keys = False
+    
     # Initialize database
     db.init_app(app)
     
@@ -4,8 +4,12 @@ Protects customer demo endpoints from unauthorized access
 """
 
 from flask import request, jsonify, g
+import atexit
 import logging
 import os
+import queue
+import threading
+import time
 from datetime import datetime, timedelta
 import hashlib
 import json
@@ -38,6 +42,28 @@ DEMO_KEYS = {
     # Add more as needed
 }
 
+# Usage log entries are queued by request threads and appended in batches
+# by a background writer so requests never wait on file I/O
+USAGE_LOG_FILE = os.path.join('logs', 'demo_usage.log')
+USAGE_LOG_FLUSH_INTERVAL = 0.1  # seconds
+USAGE_LOG_MAX_BATCH = 1000
+
+_usage_log_queue = queue.SimpleQueue()
+_usage_log_write_lock = threading.Lock()
+# Lines queued or taken by the writer but not yet written; flush_usage_log
+# waits on this so a batch the writer is holding isn't lost at shutdown
+_usage_log_pending = 0
+_usage_log_written = threading.Condition()
+USAGE_LOG_SHUTDOWN_TIMEOUT = 2.0  # seconds
+_usage_log_writer = None
+_usage_log_fd = None
+
+USAGE_LIMIT_EXCEEDED = {
+    'error': 'Demo usage limit exceeded',
+    'message': 'You have reached your demo limit. Contact samueldbrewer@gmail.com for full access',
+    'status': 'limit_exceeded'
+}
+
 def require_demo_key(f):
     """Decorator to require demo API key for protected endpoints"""
     from functools import wraps
@@ -48,7 +74,7 @@ def require_demo_key(f):
         demo_key = request.headers.get('X-Demo-Key')
         
         if not demo_key:
-            logger.warning(f"Demo access attempt without key from IP: {request.remote_addr}")
+            logger.warning("Demo access attempt without key from IP: %s", request.remote_addr)
             return jsonify({
                 'error': 'Demo API key required',
                 'message': 'Contact samueldbrewer@gmail.com for demo access',
@@ -58,16 +84,25 @@ def require_demo_key(f):
         # Validate demo key
         key_info = DEMO_KEYS.get(demo_key)
         if not key_info:
-            logger.warning(f"Invalid demo key attempted: {demo_key[:8]}... from IP: {request.remote_addr}")
+            logger.warning("Invalid demo key attempted: %s... from IP: %s", demo_key[:8], request.remote_addr)
             return jsonify({
                 'error': 'Invalid demo API key',
                 'message': 'Contact samueldbrewer@gmail.com for valid demo access',
                 'status': 'unauthorized'
             }), 401
         
+        # Check if an admin has disabled the key
+        if key_info.get('disabled'):
+            logger.info("Disabled demo key used: %s", key_info['company'])
+            return jsonify({
+                'error': 'Demo API key disabled',
+                'message': 'This demo key has been disabled. Contact samueldbrewer@gmail.com for access',
+                'status': 'disabled'
+            }), 403
+        
         # Check expiration
         if datetime.now() > key_info['expires']:
-            logger.info(f"Expired demo key used: {key_info['company']}")
+            logger.info("Expired demo key used: %s", key_info['company'])
             return jsonify({
                 'error': 'Demo API key expired',
                 'message': 'Your demo period has ended. Contact samueldbrewer@gmail.com to continue',
@@ -76,12 +111,8 @@ def require_demo_key(f):
         
         # Check usage limit
         if key_info['current_usage'] >= key_info['usage_limit']:
-            logger.info(f"Demo usage limit exceeded: {key_info['company']}")
-            return jsonify({
-                'error': 'Demo usage limit exceeded',
-                'message': 'You have reached your demo limit. Contact samueldbrewer@gmail.com for full access',
-                'status': 'limit_exceeded'
-            }), 429
+            logger.info("Demo usage limit exceeded: %s", key_info['company'])
+            return jsonify(USAGE_LIMIT_EXCEEDED), 429
         
         # Log usage
         log_demo_usage(demo_key, key_info, request)
@@ -97,6 +128,18 @@ def require_demo_key(f):
     
     return decorated_function
 
+def charge_demo_usage(key_info, uses):
+    """
+    Charge extra uses to a demo key (e.g. the further sub-calls of a batch)
+    
+    Returns:
+        bool: False, charging nothing, if the key doesn't have that many uses left
+    """
+    if key_info['current_usage'] + uses > key_info['usage_limit']:
+        return False
+    key_info['current_usage'] += uses
+    return True
+
 def log_demo_usage(demo_key, key_info, request):
     """Log demo API usage for tracking and follow-up"""
     try:
@@ -115,37 +158,116 @@ def log_demo_usage(demo_key, key_info, request):
         }
         
         # Log to file (in production, use proper logging service)
-        log_file = os.path.join('logs', 'demo_usage.log')
-        os.makedirs('logs', exist_ok=True)
+        enqueue_usage_log(json.dumps(usage_log) + '\n')
         
-        with open(log_file, 'a') as f:
-            f.write(json.dumps(usage_log) + '\n')
-        
-        logger.info(f"Demo usage logged: {key_info['company']} - {request.endpoint}")
+        logger.info("Demo usage logged: %s - %s", key_info['company'], request.endpoint)
         
     except Exception as e:
-        logger.error(f"Failed to log demo usage: {e}")
+        logger.error("Failed to log demo usage: %s", e)
+
+def enqueue_usage_log(line):
+    """Queue a usage log line for the background writer"""
+    global _usage_log_writer, _usage_log_pending
+    if _usage_log_writer is None:
+        with _usage_log_write_lock:
+            if _usage_log_writer is None:
+                _usage_log_writer = threading.Thread(
+                    target=_usage_log_writer_loop, name='demo-usage-log', daemon=True
+                )
+                _usage_log_writer.start()
+    with _usage_log_written:
+        _usage_log_pending += 1
+    _usage_log_queue.put(line)
+
+def _usage_log_writer_loop():
+    """Collect queued lines for up to USAGE_LOG_FLUSH_INTERVAL and write them in one call"""
+    while True:
+        batch = [_usage_log_queue.get()]
+        deadline = time.monotonic() + USAGE_LOG_FLUSH_INTERVAL
+        while len(batch) < USAGE_LOG_MAX_BATCH:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(_usage_log_queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+        _write_usage_log(batch)
+        _mark_usage_log_written(len(batch))
+
+def _mark_usage_log_written(count):
+    """Record that count queued lines have been written (or given up on)"""
+    global _usage_log_pending
+    with _usage_log_written:
+        _usage_log_pending -= count
+        _usage_log_written.notify_all()
+
+def _write_usage_log(batch):
+    """Append a batch of usage log lines to the log file"""
+    global _usage_log_fd
+    try:
+        with _usage_log_write_lock:
+            if _usage_log_fd is None:
+                # Opened once and kept; O_APPEND makes every write land at the end
+                os.makedirs(os.path.dirname(USAGE_LOG_FILE), exist_ok=True)
+                _usage_log_fd = os.open(USAGE_LOG_FILE, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+            data = ''.join(batch).encode()
+            while data:
+                written = os.write(_usage_log_fd, data)
+                data = data[written:]
+    except Exception as e:
+        logger.error("Failed to write demo usage log: %s", e)
+
+@atexit.register
+def flush_usage_log():
+    """Write out any usage log lines still queued, and wait for the batch the writer is holding"""
+    batch = []
+    while True:
+        try:
+            batch.append(_usage_log_queue.get_nowait())
+        except queue.Empty:
+            break
+    if batch:
+        _write_usage_log(batch)
+        _mark_usage_log_written(len(batch))
+    with _usage_log_written:
+        _usage_log_written.wait_for(lambda: _usage_log_pending <= 0, timeout=USAGE_LOG_SHUTDOWN_TIMEOUT)
 
 def add_demo_watermark(response_data):
-    """Add watermark to demo API responses"""
-    if hasattr(g, 'demo_key_info'):
-        # Add watermark information
-        watermark = {
-            '_demo_mode': True,
-            '_demo_company': g.demo_key_info['company'],
-            '_demo_usage': f"{g.demo_key_info['current_usage'] + 1}/{g.demo_key_info['usage_limit']}",
-            '_contact_sales': 'Full production access: samueldbrewer@gmail.com',
-            '_demo_expires': g.demo_key_info['expires'].isoformat()
-        }
+    """Add watermark to a demo API response dict"""
+    key_info = g.get('demo_key_info')
+    if key_info is not None:
+        # Only the usage counter changes between requests; the rest of the
+        # watermark is built once per key and reused
+        static_watermark = key_info.get('watermark')
+        if static_watermark is None:
+            static_watermark = {
+                '_demo_mode': True,
+                '_demo_company': key_info['company'],
+                '_contact_sales': 'Full production access: samueldbrewer@gmail.com',
+                '_demo_expires': key_info['expires'].isoformat()
+            }
+            key_info['watermark'] = static_watermark
         
         # Add watermark to response
-        if isinstance(response_data, dict):
-            response_data.update(watermark)
-        elif hasattr(response_data, '__dict__'):
-            response_data.__dict__.update(watermark)
+        response_data.update(static_watermark)
+        response_data['_demo_usage'] = f"{key_info['current_usage'] + 1}/{key_info['usage_limit']}"
     
     return response_data
 
+def demo_status_payload(key_info):
+    """Build the /status response for a demo key, reusing its fixed fields"""
+    static_status = key_info.get('status')
+    if static_status is None:
+        static_status = {
+            'demo_active': True,
+            'company': key_info['company'],
+            'expires': key_info['expires'].isoformat(),
+            'contact_sales': 'samueldbrewer@gmail.com'
+        }
+        key_info['status'] = static_status
+    return {**static_status, 'usage': f"{key_info['current_usage']}/{key_info['usage_limit']}"}
+
 def create_demo_key(company, contact, days=7, usage_limit=100):
     """Create a new demo API key"""
     # Generate unique key
@@ -159,10 +281,11 @@ def create_demo_key(company, contact, days=7, usage_limit=100):
         'expires': datetime.now() + timedelta(days=days),
         'usage_limit': usage_limit,
         'current_usage': 0,
+        'disabled': False,
         'created': datetime.now().isoformat()
     }
     
-    logger.info(f"Created demo key for {company}: {demo_key}")
+    logger.info("Created demo key for %s: %s", company, demo_key)
     return demo_key
 
 def list_demo_keys():
@@ -175,6 +298,7 @@ def list_demo_keys():
             'contact': info['contact'],
             'expires': info['expires'].isoformat(),
             'usage': f"{info['current_usage']}/{info['usage_limit']}",
-            'expired': datetime.now() > info['expires']
+            'expired': datetime.now() > info['expires'],
+            'disabled': info.get('disabled', False)
         })
     return keys_info
\ No newline at end of file
@@ -2,11 +2,27 @@
 
 import os
 import openai
-from serpapi import GoogleSearch
+from utils.cache import TTLCache
+from utils.http import HTTP_SESSION
+import concurrent.futures
 import logging
 
 logger = logging.getLogger(__name__)
 
+SERPAPI_SEARCH_URL = "https://serpapi.com/search"
+
+# Enrichment results only change as the web does, so identical lookups are
+# served from memory for an hour instead of repeating three SerpAPI searches
+enrichment_cache = TTLCache(maxsize=1024, ttl=3600)
+
+# The video, article and image searches are independent, so they run side by
+# side on a shared pool and the lookup takes as long as the slowest one
+_search_executor = concurrent.futures.ThreadPoolExecutor(max_workers=12)
+
+def _enrichment_cache_key(make, model, year, part_number):
+    """Normalize the lookup inputs so case and whitespace don't split the cache"""
+    return tuple(str(v).strip().lower() if v else '' for v in (make, model, year, part_number))
+
 class EnrichmentService:
     """Service for enriching part data with additional information."""
     
@@ -17,6 +33,15 @@ class EnrichmentService:
         if self.openai_api_key:
             openai.api_key = self.openai_api_key
     
+    def _google_search(self, params):
+        """Run a SerpAPI Google search over the shared keep-alive session."""
+        response = HTTP_SESSION.get(
+            SERPAPI_SEARCH_URL,
+            params={**params, "engine": "google", "output": "json", "source": "python"},
+            timeout=60
+        )
+        return response.json()
+    
     def enrich_part_data(self, part_number, description="", make="", model=""):
         """Enrich part data with additional information."""
         try:
@@ -93,13 +118,11 @@ class EnrichmentService:
             
             query = f"{part_number} compatibility {make} models"
             
-            search = GoogleSearch({
+            results = self._google_search({
                 "q": query,
                 "api_key": self.serpapi_key,
                 "num": 3
             })
-            
-            results = search.get_dict()
             compatibility_info = []
             
             if "organic_results" in results:
@@ -124,13 +147,11 @@ class EnrichmentService:
             
             query = f"{part_number} price buy"
             
-            search = GoogleSearch({
+            results = self._google_search({
                 "q": query,
                 "api_key": self.serpapi_key,
                 "num": 5
             })
-            
-            results = search.get_dict()
             pricing_info = []
             
             if "organic_results" in results:
@@ -151,6 +172,22 @@ class EnrichmentService:
             return None
     
     def get_enrichment_data(self, make, model, year=None, part_number=None):
+        """Get enrichment data for equipment or parts, cached by (make, model, year, part_number)."""
+        key = _enrichment_cache_key(make, model, year, part_number)
+        result = enrichment_cache.get(key)
+        if result is not None:
+            logger.info("Enrichment cache hit for %s", key)
+        else:
+            result = self._fetch_enrichment_data(make, model, year, part_number)
+            # Only successful lookups are cached so failures get retried. The
+            # search helpers turn SerpAPI errors into empty lists, so a result
+            # with nothing at all is treated as a failure too
+            if result.get('success') and any(result['data'].values()):
+                enrichment_cache.set(key, result)
+        # Shallow copy so callers can annotate the response without touching the cache
+        return dict(result)
+    
+    def _fetch_enrichment_data(self, make, model, year=None, part_number=None):
         """Get enrichment data for equipment or parts with optimized search queries."""
         try:
             # Build base equipment identifier
@@ -174,9 +211,12 @@ class EnrichmentService:
                 }
             
             # Search for multimedia content with optimized queries
-            videos = self._search_videos(context)
-            articles = self._search_articles(context) 
-            images = self._search_images(context)
+            videos_future = _search_executor.submit(self._search_videos, context)
+            articles_future = _search_executor.submit(self._search_articles, context)
+            images_future = _search_executor.submit(self._search_images, context)
+            videos = videos_future.result()
+            articles = articles_future.result()
+            images = images_future.result()
             
             return {
                 "success": True,
@@ -213,14 +253,12 @@ class EnrichmentService:
             else:
                 query = f"{context['equipment']} video"
             
-            search = GoogleSearch({
+            results = self._google_search({
                 "q": query,
                 "tbm": "vid",
                 "api_key": self.serpapi_key,
                 "num": 8
             })
-            
-            results = search.get_dict()
             videos = []
             
             for result in results.get("video_results", []):
@@ -251,14 +289,12 @@ class EnrichmentService:
             else:
                 query = f"{context['equipment']} manual documentation"
             
-            search = GoogleSearch({
+            results = self._google_search({
                 "q": query,
                 "api_key": self.serpapi_key,
                 "num": 8,
                 "hl": "en"
             })
-            
-            results = search.get_dict()
             articles = []
             
             for result in results.get("organic_results", []):
@@ -302,15 +338,13 @@ class EnrichmentService:
             else:
                 query = f"{context['equipment']} image"
             
-            search = GoogleSearch({
+            results = self._google_search({
                 "q": query,
                 "tbm": "isch",
                 "api_key": self.serpapi_key,
                 "num": 10,
                 "safe": "active"
             })
-            
-            results = search.get_dict()
             images = []
             
             for result in results.get("images_results", []):
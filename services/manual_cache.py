@@ -0,0 +1,108 @@
+"""Cache of per-PDF facts (page count, model checks, preview) so a manual seen again needs no download."""
+
+import hashlib
+import json
+import logging
+import os
+import tempfile
+from utils.cache import TTLCache
+from utils.http import HTTP_SESSION
+
+logger = logging.getLogger(__name__)
+
+MANUAL_META_CACHE_DIR = os.environ.get('MANUAL_META_CACHE_DIR', os.path.join('cache', 'manual_meta'))
+HASH_CHUNK_SIZE = 1024 * 1024
+
+# URL -> (validator, cache key). The validator (ETag / Content-Length /
+# Last-Modified from a HEAD request) tells us the URL still serves the same file.
+_url_index = TTLCache(maxsize=4096, ttl=86400)
+# content sha256 (or url_key) -> metadata, in front of the JSON files on disk
+_meta_cache = TTLCache(maxsize=4096, ttl=86400)
+
+
+def url_validator(url):
+    """Cheap identity for the file behind a URL, or None if the server gives nothing usable."""
+    try:
+        response = HTTP_SESSION.head(url, timeout=(5, 10), allow_redirects=True)
+        if response.status_code != 200:
+            return None
+        headers = response.headers
+        validator = (headers.get('ETag'), headers.get('Content-Length'), headers.get('Last-Modified'))
+        return validator if any(validator) else None
+    except Exception as e:
+        logger.debug("HEAD failed for %s: %s", url, e)
+        return None
+
+
+def file_sha256(path):
+    """SHA-256 of a file, read in chunks."""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def url_key(url, validator):
+    """Cache key for metadata learned without the full file (e.g. from a ranged fetch)."""
+    return 'url-' + hashlib.sha256(f"{url}|{validator}".encode('utf-8')).hexdigest()
+
+
+def _meta_path(key):
+    return os.path.join(MANUAL_META_CACHE_DIR, f"{key}.json")
+
+
+def get_by_hash(key):
+    """Cached metadata for PDF content (or a url_key), or None."""
+    meta = _meta_cache.get(key)
+    if meta is not None:
+        return meta
+    try:
+        with open(_meta_path(key), encoding='utf-8') as f:
+            meta = json.load(f)
+    except (OSError, ValueError):
+        return None
+    _meta_cache.set(key, meta)
+    return meta
+
+
+def get_by_url(url, validator):
+    """Cached metadata for a URL whose validator still matches, or None."""
+    if validator is None:
+        return None
+    entry = _url_index.get(url)
+    if entry is None or entry[0] != validator:
+        return None
+    return get_by_hash(entry[1])
+
+
+def put(key, meta, url=None, validator=None):
+    """
+    Store metadata under a content hash (or url_key) and, when a validator is
+    known, index the URL to it.
+
+    Written atomically so concurrent requests never read a partial file.
+    """
+    _meta_cache.set(key, meta)
+    if url and validator is not None:
+        _url_index.set(url, (validator, key))
+    try:
+        os.makedirs(MANUAL_META_CACHE_DIR, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=MANUAL_META_CACHE_DIR, suffix='.tmp')
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump(meta, f)
+        os.replace(tmp_path, _meta_path(key))
+    except OSError as e:
+        logger.warning("Could not cache manual metadata for %s: %s", key, e)
+
+
+def clear():
+    """Drop all cached manual metadata, in memory and on disk."""
+    _url_index.clear()
+    _meta_cache.clear()
+    try:
+        for name in os.listdir(MANUAL_META_CACHE_DIR):
+            if name.endswith('.json'):
+                os.unlink(os.path.join(MANUAL_META_CACHE_DIR, name))
+    except FileNotFoundError:
+        pass
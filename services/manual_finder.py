@@ -1,13 +1,23 @@
 """Manual finder service for searching and downloading technical manuals."""
 
+import hashlib
+import io
 import os
-import requests
+import re
+import fitz  # PyMuPDF
+from functools import lru_cache
 from serpapi import GoogleSearch
 import tempfile
 import logging
+from utils.http import HTTP_SESSION
 
 logger = logging.getLogger(__name__)
 
+DOWNLOAD_CHUNK_SIZE = 1024 * 1024
+MAX_PDF_BYTES = int(os.environ.get('MAX_PDF_BYTES', 200 * 1024 * 1024))
+# Manuals up to this size are analysed in memory instead of via a temp file
+SPOOL_MAX_BYTES = int(os.environ.get('MANUAL_SPOOL_MAX_BYTES', 32 * 1024 * 1024))
+
 class ManualFinder:
     """Service for finding technical manuals using SerpAPI."""
     
@@ -54,29 +64,69 @@ class ManualFinder:
                 "count": 0
             }
     
-    def download_manual(self, url, filename=None):
-        """Download a manual from URL."""
+    def download_manual(self, url, filename=None, digest=None, spool_max_bytes=None):
+        """
+        Download a manual from URL, feeding each chunk to digest (a hashlib object) if given.
+        
+        With spool_max_bytes and no filename, a manual whose Content-Length is
+        at most that size is kept in memory and returned as "content" instead
+        of being written to a temporary file.
+        """
+        created_file = False
+        content = None
         try:
-            response = requests.get(url, timeout=30)
-            response.raise_for_status()
-            
-            if not filename:
-                filename = tempfile.mktemp(suffix=".pdf")
-            
-            with open(filename, 'wb') as f:
-                f.write(response.content)
+            # Stream to the destination so large bodies are never held in memory
+            # and each chunk is written while the next one is still in flight
+            size = 0
+            with HTTP_SESSION.get(url, timeout=(10, 30), stream=True) as response:
+                response.raise_for_status()
+                
+                # Refuse oversized manuals before reading the body
+                content_length = response.headers.get('Content-Length')
+                if content_length and content_length.isdigit() and int(content_length) > MAX_PDF_BYTES:
+                    raise ValueError(f"Manual is {int(content_length)} bytes, over the {MAX_PDF_BYTES} byte limit")
+                
+                in_memory = (not filename and spool_max_bytes is not None and content_length
+                             and content_length.isdigit() and int(content_length) <= spool_max_bytes)
+                if in_memory:
+                    f = io.BytesIO()
+                elif filename:
+                    f = open(filename, 'wb')
+                else:
+                    f = tempfile.NamedTemporaryFile(suffix=".pdf", delete=False)
+                    filename = f.name
+                created_file = not in_memory
+                
+                with f:
+                    for chunk in response.iter_content(chunk_size=DOWNLOAD_CHUNK_SIZE):
+                        size += len(chunk)
+                        # Content-Length can be missing or wrong, so enforce the limit as we go
+                        if size > MAX_PDF_BYTES:
+                            raise ValueError(f"Manual exceeds the {MAX_PDF_BYTES} byte limit")
+                        f.write(chunk)
+                        if digest is not None:
+                            digest.update(chunk)
+                    if in_memory:
+                        content = f.getvalue()
             
             return {
                 "success": True,
                 "filename": filename,
-                "size": len(response.content)
+                "content": content,
+                "size": size
             }
             
         except Exception as e:
             logger.error(f"Error downloading manual: {e}")
+            if created_file:
+                try:
+                    os.remove(filename)
+                except OSError:
+                    pass
             return {
                 "success": False,
-                "error": str(e)
+                "error": str(e),
+                "exception": e
             }
 
 # Standalone function wrappers for backwards compatibility
@@ -92,33 +142,118 @@ def search_manuals(make, model, manual_type="technical manual", year=None):
         logger.error(f"Search failed: {result['error']}")
         return []
 
-def download_manual(url, filename=None):
+def download_manual(url, filename=None, digest=None):
     """Standalone function wrapper for manual download."""
     finder = ManualFinder()
-    result = finder.download_manual(url, filename)
+    result = finder.download_manual(url, filename, digest)
     
     if result['success']:
         return result['filename']
     else:
         raise Exception(result['error'])
 
-def verify_manual_contains_model(file_path, model):
-    """Verify if a manual contains references to a specific model."""
+# Anything smaller than this is an error page or a truncated download
+MIN_PDF_BYTES = 1024
+
+def is_valid_pdf(file_path):
+    """Cheaply check that a downloaded manual is still a usable PDF (size and %PDF- header)."""
+    if not file_path:
+        return False
     try:
-        import fitz  # PyMuPDF
-        doc = fitz.open(file_path)
+        if os.path.getsize(file_path) < MIN_PDF_BYTES:
+            return False
+        with open(file_path, 'rb') as f:
+            return f.read(5) == b'%PDF-'
+    except OSError:
+        return False
+
+# Letter runs, digit runs and anything else, within one part of a model number
+MODEL_RUN_RE = re.compile(r'[a-z]+|\d+|[^a-z\d]+')
+OPTIONAL_SEPARATOR = r'[\s-]?'
+
+@lru_cache(maxsize=256)
+def _model_pattern(model):
+    """
+    One compiled pattern for the common spellings of a model number. A space
+    or hyphen is optional where the model already has one and where letters
+    meet digits, so 'ABC-123', 'ABC123' and 'ABC 123' all match each other,
+    but nowhere else ('ABC' does not match 'A B C'). Each page is scanned once.
+    """
+    parts = []
+    for part in re.split(r'[\s-]+', model.lower().strip()):
+        runs = MODEL_RUN_RE.findall(part)
+        pattern = re.escape(runs[0]) if runs else ''
+        for prev, run in zip(runs, runs[1:]):
+            # Only a letter/digit boundary gets an optional separator
+            boundary = (prev.isalpha() and run.isdigit()) or (prev.isdigit() and run.isalpha())
+            pattern += (OPTIONAL_SEPARATOR if boundary else '') + re.escape(run)
+        if pattern:
+            parts.append(pattern)
+    return re.compile(OPTIONAL_SEPARATOR.join(parts))
+
+def contains_model(text, model):
+    """Whether lowercased text mentions any spelling of model."""
+    return _model_pattern(model).search(text) is not None
+
+# Bytes fetched by quick_verify; enough for the first pages of most manuals
+QUICK_VERIFY_BYTES = 512 * 1024
+# Model names appear on the cover or first pages; later pages are never parsed
+VERIFY_PAGES = int(os.environ.get('MANUAL_VERIFY_PAGES', 5))
+
+def iter_page_texts(doc, max_pages=VERIFY_PAGES):
+    """Lowercased text of a document's first pages, parsed one page at a time as the caller asks."""
+    for page_num in range(min(max_pages, doc.page_count)):
+        yield doc.load_page(page_num).get_text().lower()
+
+def quick_verify(url, model, prefix_bytes=QUICK_VERIFY_BYTES):
+    """
+    Check page count and model name from the start of a PDF using an HTTP Range
+    request instead of downloading the whole file.
+
+    MuPDF repairs the truncated prefix, which usually still exposes the page
+    tree and the first pages. Returns {'pages': int, 'model_verified': bool}
+    when that is conclusive, or None when the caller should fall back to a
+    full download (no Range support, model not found in a partial file, or an
+    unreadable prefix).
+    """
+    try:
+        with HTTP_SESSION.get(url, headers={'Range': f'bytes=0-{prefix_bytes - 1}'},
+                              timeout=(5, 30), stream=True) as response:
+            # 200 means the server ignored the Range header and is sending everything
+            if response.status_code != 206:
+                return None
+            content = response.raw.read(prefix_bytes, decode_content=True)
+            content_range = response.headers.get('Content-Range', '')
         
-        # Search first few pages for model references
-        for page_num in range(min(5, len(doc))):
-            page = doc[page_num]
-            text = page.get_text().lower()
-            
-            if model.lower() in text:
-                doc.close()
-                return True
+        total = content_range.rsplit('/', 1)[-1]
+        complete = total.isdigit() and int(total) <= len(content)
+        if not content.startswith(b'%PDF-'):
+            return None
         
-        doc.close()
-        return False
+        with fitz.open(stream=content, filetype='pdf') as doc:
+            page_count = doc.page_count
+            if not page_count:
+                return None
+            try:
+                if any(contains_model(text, model) for text in iter_page_texts(doc)):
+                    return {'pages': page_count, 'model_verified': True}
+            except Exception:
+                # A page lies beyond the fetched prefix
+                pass
+        
+        if complete:
+            return {'pages': page_count, 'model_verified': False}
+        return None
+    except Exception as e:
+        logger.debug("Quick verify failed for %s: %s", url, e)
+        return None
+
+def verify_manual_contains_model(file_path, model):
+    """Verify if a manual contains references to a specific model."""
+    try:
+        with fitz.open(file_path) as doc:
+            # Stops parsing at the first page that mentions any spelling of the model
+            return any(contains_model(text, model) for text in iter_page_texts(doc))
     except Exception as e:
         logger.error(f"Error verifying model in manual: {e}")
         return True  # Default to include if can't verify
@@ -126,11 +261,49 @@ def verify_manual_contains_model(file_path, model):
 def get_pdf_page_count(file_path):
     """Get the number of pages in a PDF file."""
     try:
-        import fitz  # PyMuPDF
-        doc = fitz.open(file_path)
-        page_count = len(doc)
-        doc.close()
-        return page_count
+        # Opening only reads the xref and page tree; no page content is parsed
+        with fitz.open(file_path) as doc:
+            return doc.page_count
     except Exception as e:
         logger.error(f"Error getting PDF page count: {e}")
-        return None
\ No newline at end of file
+        return None
+
+def fetch_and_analyze(url, model):
+    """
+    Download a manual once and learn everything the search needs from it.
+    
+    The SHA-256 is computed as the chunks arrive, and the PDF is opened once
+    for both the page count and the model check. Manuals up to
+    SPOOL_MAX_BYTES stay in memory and are returned as 'content' with 'path'
+    None; larger ones are written to a temporary file that the caller owns
+    and must remove.
+    
+    Returns:
+        dict: {'path', 'content', 'sha256', 'pages', 'model_verified'}
+    """
+    digest = hashlib.sha256()
+    result = ManualFinder().download_manual(url, digest=digest, spool_max_bytes=SPOOL_MAX_BYTES)
+    if not result['success']:
+        # Re-raised as is so callers can tell connection failures from bad files
+        raise result['exception']
+    path = result['filename']
+    content = result['content']
+    try:
+        if content is not None:
+            doc = fitz.open(stream=content, filetype='pdf')
+        else:
+            doc = fitz.open(path)
+        with doc:
+            pages = doc.page_count
+            model_verified = any(contains_model(text, model) for text in iter_page_texts(doc))
+    except Exception as e:
+        logger.error(f"Error reading downloaded manual: {e}")
+        pages = None
+        model_verified = True  # Default to include if can't verify
+    return {
+        'path': path,
+        'content': content,
+        'sha256': digest.hexdigest(),
+        'pages': pages,
+        'model_verified': model_verified
+    }
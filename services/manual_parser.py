@@ -3,10 +3,33 @@
 import fitz  # PyMuPDF
 import openai
 import os
+import gzip
+import hashlib
+import json
 import logging
+import re
+import tempfile
+from services.manual_cache import file_sha256
+from utils.cache import SingleFlight, TTLCache
 
 logger = logging.getLogger(__name__)
 
+# Extracted manual text is kept on disk so repeated processing of the same
+# manual skips the PDF parse
+MANUAL_TEXT_CACHE_DIR = os.environ.get('MANUAL_TEXT_CACHE_DIR', os.path.join('cache', 'manual_text'))
+
+# Recently extracted text keyed by (path, mtime, size), in front of the disk cache
+extracted_text_cache = TTLCache(maxsize=64, ttl=3600)
+
+# AI extraction results keyed by a hash of the text that was analyzed
+extraction_cache = TTLCache(maxsize=256, ttl=86400)
+
+# Concurrent requests for the same text share one in-flight AI call
+_inflight_extractions = SingleFlight()
+
+# Outermost {...} in a model reply that may wrap the JSON in extra text
+JSON_OBJECT_RE = re.compile(r'\{.*\}', re.DOTALL)
+
 class ManualParser:
     """Service for parsing PDF manuals and extracting information."""
     
@@ -16,15 +39,10 @@ class ManualParser:
     def extract_text_from_pdf(self, pdf_path):
         """Extract text from PDF file."""
         try:
-            doc = fitz.open(pdf_path)
-            text = ""
-            page_count = len(doc)
-            
-            for page_num in range(page_count):
-                page = doc.load_page(page_num)
-                text += page.get_text()
-            
-            doc.close()
+            with fitz.open(pdf_path) as doc:
+                page_count = len(doc)
+                # Join once instead of growing one string page by page
+                text = "".join(page.get_text() for page in doc)
             
             return {
                 "success": True,
@@ -147,6 +165,46 @@ class ManualParser:
                 "raw_text": ""
             }
 
+# Text-based manuals carry well over this many characters per page; scanned
+# manuals come back close to empty from get_text()
+SCANNED_PDF_CHARS_PER_PAGE = 200
+PDF_TYPE_SAMPLE_PAGES = 5
+
+def _text_chars(text):
+    """Printable, non-space characters in text"""
+    return sum(1 for ch in text if ch.isprintable() and not ch.isspace())
+
+def detect_pdf_type(pdf_path, sample_pages=PDF_TYPE_SAMPLE_PAGES, text=None):
+    """
+    Classify a PDF as text-based or scanned.
+
+    Pages are sampled evenly through the document, so an image-only cover or
+    blank inside cover can't decide it alone. Pass the full extracted text
+    to classify from every page instead.
+
+    Returns:
+        dict: pdf_type ('text' or 'scanned'), chars_per_page and page_count
+    """
+    with fitz.open(pdf_path) as doc:
+        page_count = doc.page_count
+        if text is not None:
+            sampled = page_count
+            chars = _text_chars(text)
+        else:
+            sampled = min(page_count, sample_pages)
+            if sampled > 1:
+                page_nums = sorted({round(i * (page_count - 1) / (sampled - 1)) for i in range(sampled)})
+            else:
+                page_nums = range(sampled)
+            chars = sum(_text_chars(doc.load_page(page_num).get_text()) for page_num in page_nums)
+
+    chars_per_page = chars / sampled if sampled else 0
+    return {
+        'pdf_type': 'text' if chars_per_page >= SCANNED_PDF_CHARS_PER_PAGE else 'scanned',
+        'chars_per_page': round(chars_per_page, 1),
+        'page_count': page_count
+    }
+
 # Standalone function wrappers for backwards compatibility
 def extract_text_from_pdf(pdf_path):
     """Standalone function wrapper for text extraction."""
@@ -158,12 +216,69 @@ def extract_text_from_pdf(pdf_path):
     else:
         raise Exception(result['error'])
 
+def extract_text_cached(pdf_path):
+    """
+    Extract text from a PDF, reusing earlier extractions of the same file.
+
+    Recent results are kept in memory keyed by path, mtime and size; behind
+    that, gzipped text is kept on disk keyed by the SHA-256 of the PDF, so the
+    same manual downloaded again (or under another record) skips the parse.
+    The cache file is written atomically so concurrent requests never read a
+    partial copy.
+    """
+    stat = os.stat(pdf_path)
+    memo_key = (os.path.abspath(pdf_path), stat.st_mtime_ns, stat.st_size)
+    text = extracted_text_cache.get(memo_key)
+    if text is not None:
+        return text
+
+    cache_path = os.path.join(MANUAL_TEXT_CACHE_DIR, f"{file_sha256(pdf_path)}.txt.gz")
+    try:
+        with gzip.open(cache_path, 'rt', encoding='utf-8') as f:
+            text = f.read()
+    except (OSError, EOFError):
+        text = None
+
+    if text is None:
+        text = extract_text_from_pdf(pdf_path)
+        try:
+            os.makedirs(MANUAL_TEXT_CACHE_DIR, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=MANUAL_TEXT_CACHE_DIR, suffix='.tmp')
+            with os.fdopen(fd, 'wb') as raw, gzip.open(raw, 'wt', encoding='utf-8') as f:
+                f.write(text)
+            os.replace(tmp_path, cache_path)
+        except OSError as e:
+            logger.warning("Could not cache extracted text for %s: %s", pdf_path, e)
+
+    extracted_text_cache.set(memo_key, text)
+    return text
+
 def extract_information(text, manual_id=None):
+    """Extract comprehensive information from manual text, reusing results for identical text."""
+    key = hashlib.sha1(text.encode('utf-8', 'surrogatepass')).hexdigest()
+    serialized = extraction_cache.get(key)
+    if serialized is not None:
+        logger.info("Reusing AI extraction for manual %s", manual_id or key[:12])
+    else:
+        serialized = _inflight_extractions.do(key, _extract_and_cache, text, manual_id, key)
+    # Results travel serialized so every caller gets its own copy to mutate
+    return json.loads(serialized)
+
+def _extract_and_cache(text, manual_id, key):
+    """Run the AI extraction and cache the serialized result under key"""
+    extracted_info = _extract_information(text, manual_id)
+    serialized = json.dumps(extracted_info)
+
+    # Empty results are what the failure paths return, so don't pin them
+    if extracted_info['error_codes'] or extracted_info['part_numbers']:
+        extraction_cache.set(key, serialized)
+
+    return serialized
+
+def _extract_information(text, manual_id=None):
     """Extract comprehensive information from manual text using GPT-4.1-Nano."""
     try:
         from openai import OpenAI
-        import json
-        import re
         
         # Initialize OpenAI client
         openai_api_key = os.environ.get('OPENAI_API_KEY')
@@ -267,7 +382,7 @@ def extract_information(text, manual_id=None):
         content = response.choices[0].message.content
         
         # Extract JSON from response (handle cases where model adds extra text)
-        json_match = re.search(r'\{.*\}', content, re.DOTALL)
+        json_match = JSON_OBJECT_RE.search(content)
         if json_match:
             json_str = json_match.group(0)
             extracted_info = json.loads(json_str)
@@ -302,8 +417,6 @@ def extract_components(text, custom_prompt=None):
     """Extract structural components from manual text."""
     try:
         from openai import OpenAI
-        import json
-        import re
         
         # Initialize OpenAI client
         openai_api_key = os.environ.get('OPENAI_API_KEY')
@@ -353,7 +466,7 @@ def extract_components(text, custom_prompt=None):
         content = response.choices[0].message.content
         
         # Extract JSON from response
-        json_match = re.search(r'\{.*\}', content, re.DOTALL)
+        json_match = JSON_OBJECT_RE.search(content)
         if json_match:
             json_str = json_match.group(0)
             components = json.loads(json_str)
@@ -33,4 +33,15 @@ class PDFPreviewGenerator:
             
         except Exception as e:
             logger.error(f"Error generating PDF preview from file: {e}")
-            return None
\ No newline at end of file
+            return None
+    
+    def generate_preview_from_bytes(self, pdf_bytes):
+        """Generate a preview image from PDF content already in memory."""
+        try:
+            # For Railway deployment, we'll return None to indicate preview not available
+            logger.info(f"PDF preview generation not available in Railway environment for {len(pdf_bytes)} byte PDF")
+            return None
+            
+        except Exception as e:
+            logger.error(f"Error generating PDF preview from bytes: {e}")
+            return None
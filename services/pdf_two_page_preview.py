@@ -33,4 +33,15 @@ class PDFTwoPagePreview:
             
         except Exception as e:
             logger.error(f"Error generating two-page PDF preview from file: {e}")
-            return None
\ No newline at end of file
+            return None
+    
+    def generate_from_bytes(self, pdf_bytes):
+        """Generate a two-page preview image from PDF content already in memory."""
+        try:
+            # For Railway deployment, we'll return None to indicate preview not available
+            logger.info(f"Two-page PDF preview generation not available in Railway environment for {len(pdf_bytes)} byte PDF")
+            return None
+            
+        except Exception as e:
+            logger.error(f"Error generating two-page PDF preview from bytes: {e}")
+            return None
@@ -0,0 +1,28 @@
+"""Shared HTTP session so outbound requests reuse pooled keep-alive connections."""
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+
+def build_session(pool_connections=20, pool_maxsize=50, retries=2):
+    """Create a requests.Session with a pooled adapter that retries idempotent requests."""
+    session = requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=pool_connections,
+        pool_maxsize=pool_maxsize,
+        max_retries=Retry(
+            total=retries,
+            backoff_factor=0.3,
+            status_forcelist=(502, 503, 504),
+            allowed_methods=frozenset(['GET', 'HEAD']),
+            raise_on_status=False
+        )
+    )
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    return session
+
+
+# One session per process; requests.Session is safe to share for plain GETs
+HTTP_SESSION = build_session()
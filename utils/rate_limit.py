@@ -0,0 +1,32 @@
+"""Logging filter that caps how fast a logger can emit under a failure storm."""
+
+import logging
+import threading
+import time
+
+
+class RateLimitFilter(logging.Filter):
+    """Drop records once more than max_per_second have been emitted in the current second."""
+
+    def __init__(self, max_per_second=10):
+        super().__init__()
+        self.max_per_second = max_per_second
+        self._window = 0
+        self._count = 0
+        self._dropped = 0
+        self._lock = threading.Lock()
+
+    def filter(self, record):
+        now = int(time.monotonic())
+        with self._lock:
+            if now != self._window:
+                if self._dropped:
+                    record.msg = f"{record.msg} ({self._dropped} similar messages suppressed)"
+                self._window = now
+                self._count = 0
+                self._dropped = 0
+            self._count += 1
+            if self._count > self.max_per_second:
+                self._dropped += 1
+                return False
+        return True
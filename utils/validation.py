@@ -0,0 +1,15 @@
+"""Field types shared by the pydantic request schemas."""
+
+from typing import Annotated
+from pydantic import BeforeValidator
+
+
+def _number_to_str(value):
+    """Accept bare JSON numbers where an identifier string is expected."""
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return str(value)
+    return value
+
+
+# Makes, models and part numbers are often sent as numbers (e.g. "model": 5801)
+NumericStr = Annotated[str, BeforeValidator(_number_to_str)]